@@ -16,6 +16,13 @@ HORIZON_CONFIG = {
     'ajax_queue_limit': 10,
     'ajax_poll_interval': 2500,
 
+    # Number of objects a batch action may act on at once.
+    'batch_action_concurrency': 1,
+
+    # API call instrumentation, see ApiTimingMiddleware.
+    'api_timing_log': False,
+    'api_timing_history': 100,
+
     # URL for additional help with this site.
     'help_url': None,
 
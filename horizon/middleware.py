@@ -24,18 +24,22 @@ Middleware provided and used by Horizon.
 import datetime
 import json
 import logging
+import time
 
 from django.conf import settings
 from django.contrib.auth import REDIRECT_FIELD_NAME
 from django.contrib.auth.views import redirect_to_login
 from django.contrib import messages as django_messages
+from django.core.exceptions import MiddlewareNotUsed
 from django import http
 from django.http import HttpResponseRedirect
 from django import shortcuts
 from django.utils.encoding import iri_to_uri
 from django.utils import timezone
 
+from horizon import conf
 from horizon import exceptions
+from horizon.utils import instrumentation
 
 
 LOG = logging.getLogger(__name__)
@@ -127,3 +131,36 @@ class HorizonMiddleware(object):
                 # etc.) and is not meant as a long-term solution.
                 response['X-Horizon-Messages'] = json.dumps(queued_msgs)
         return response
+
+
+class ApiTimingMiddleware(object):
+    """
+    Reports the API calls made while handling a request in a
+    ``Server-Timing`` header, and keeps a summary of the request for the
+    API timing debug page. If ``HORIZON_CONFIG['api_timing_log']`` is set
+    the summary is logged as well.
+
+    The timings reveal details of the backends, so the middleware is only
+    used when ``DEBUG`` is ``True``.
+    """
+
+    def __init__(self):
+        if not settings.DEBUG:
+            raise MiddlewareNotUsed()
+
+    def process_request(self, request):
+        request._api_timing_start = time.time()
+
+    def process_response(self, request, response):
+        start = getattr(request, "_api_timing_start", None)
+        if start is None:
+            return response
+        duration = time.time() - start
+        calls = instrumentation.get_calls(request)
+        response['Server-Timing'] = instrumentation.server_timing(calls,
+                                                                  duration)
+        summary = instrumentation.summarize(request, duration)
+        instrumentation.add_recent_request(summary)
+        if conf.HORIZON_CONFIG['api_timing_log']:
+            LOG.info(json.dumps(summary))
+        return response
@@ -44,4 +44,6 @@ if settings.DEBUG:
     urlpatterns += patterns('',
         url(r'^qunit/$',
             TemplateView.as_view(template_name="horizon/qunit.html"),
-            name='qunit_tests'))
+            name='qunit_tests'),
+        url(r'^debug/api_timing/$', 'horizon.views.api_timing',
+            name='api_timing'))
@@ -15,83 +15,25 @@ horizon.datatables = {
         $table.removeAttr('decay_constant');
         return;
       }
-      // Trigger the update handlers.
+      // Trigger the update handlers. Rows which can be updated together
+      // are coalesced into one request per table.
+      var batches = {};
       $rows_to_update.each(function(index, row) {
         var $row = $(this),
-            $table = $row.closest('table.datatable');
-        horizon.ajax.queue({
-          url: $row.attr('data-update-url'),
-          error: function (jqXHR, textStatus, errorThrown) {
-            switch (jqXHR.status) {
-              // A 404 indicates the object is gone, and should be removed from the table
-              case 404:
-                // Update the footer count and reset to default empty row if needed
-                var $footer, row_count, footer_text, colspan, template, params, $empty_row;
-
-                // existing count minus one for the row we're removing
-                horizon.datatables.update_footer_count($table, -1);
-
-                if(row_count === 0) {
-                  colspan = $table.find('th[colspan]').attr('colspan');
-                  template = horizon.templates.compiled_templates["#empty_row_template"];
-                  params = {"colspan": colspan};
-                  empty_row = template.render(params);
-                  $row.replaceWith(empty_row);
-                } else {
-                  $row.remove();
-                }
-                // Reset tablesorter's data cache.
-                $table.trigger("update");
-                break;
-              default:
-                horizon.utils.log(gettext("An error occurred while updating."));
-                $row.removeClass("ajax-update");
-                $row.find("i.ajax-updating").remove();
-                break;
-            }
-          },
-          success: function (data, textStatus, jqXHR) {
-            var $new_row = $(data);
-
-            if ($new_row.hasClass('status_unknown')) {
-              var spinner_elm = $new_row.find("td.status_unknown:last");
-
-              if ($new_row.find('a.btn-action-required').length > 0) {
-                spinner_elm.prepend(
-                     $("<div />")
-                     .addClass("action_required_img")
-                     .append(
-                         $("<img />")
-                         .attr("src", "/static/dashboard/img/action_required.png")));
-              } else {
-                // Replacing spin.js here with an animated gif to reduce CPU
-                spinner_elm.prepend(
-                     $("<div />")
-                     .addClass("loading_gif")
-                     .append(
-                         $("<img />")
-                         .attr("src", "/static/dashboard/img/loading.gif")));
-              }
-            }
-
-            // Only replace row if the html content has changed
-            if($new_row.html() != $row.html()) {
-              if($row.find(':checkbox').is(':checked')) {
-                // Preserve the checkbox if it's already clicked
-                $new_row.find(':checkbox').prop('checked', true);
-              }
-              $row.replaceWith($new_row);
-              // Reset tablesorter's data cache.
-              $table.trigger("update");
-              // Reset decay constant.
-              $table.removeAttr('decay_constant');
-            }
-          },
-          complete: function (jqXHR, textStatus) {
-            // Revalidate the button check for the updated table
-            horizon.datatables.validate_button();
-          }
-        });
+            batch_url = $row.attr('data-update-batch-url');
+        if (batch_url) {
+          batches[batch_url] = batches[batch_url] || [];
+          batches[batch_url].push($row);
+        } else {
+          horizon.datatables.update_row($row);
+        }
+      });
+      $.each(batches, function (batch_url, rows) {
+        var size = horizon.datatables.batch_size, i;
+        // Keep the query string of each request to a reasonable length.
+        for (i = 0; i < rows.length; i += size) {
+          horizon.datatables.update_rows(batch_url, rows.slice(i, i + size));
+        }
       });
 
       // Set interval decay to this table, and increase if it already exist
@@ -109,6 +51,146 @@ horizon.datatables = {
     }
   },
 
+  // Maximum number of rows to update in a single request.
+  batch_size: 40,
+
+  update_row: function ($row) {
+    var $table = $row.closest('table.datatable'),
+        etag = $row.attr('data-update-etag'),
+        headers = {};
+    // Let the server skip rendering rows which haven't changed.
+    if (etag) {
+      headers['If-None-Match'] = '"' + etag + '"';
+    }
+    horizon.ajax.queue({
+      url: $row.attr('data-update-url'),
+      headers: headers,
+      error: function (jqXHR, textStatus, errorThrown) {
+        horizon.datatables.update_row_failed($table, $row, jqXHR.status);
+      },
+      success: function (data, textStatus, jqXHR) {
+        if (jqXHR.status !== 304) {
+          horizon.datatables.replace_row($table, $row, data);
+        }
+      },
+      complete: function (jqXHR, textStatus) {
+        // Revalidate the button check for the updated table
+        horizon.datatables.validate_button();
+      }
+    });
+  },
+
+  update_rows: function (url, rows) {
+    var $table = rows[0].closest('table.datatable'),
+        obj_ids = $.map(rows, function ($row) {
+          return $row.attr('data-object-id');
+        }),
+        etags = $.map(rows, function ($row) {
+          return $row.attr('data-update-etag') || '';
+        });
+    horizon.ajax.queue({
+      url: url,
+      data: {obj_id: obj_ids, etag: etags},
+      traditional: true,
+      dataType: 'json',
+      error: function (jqXHR, textStatus, errorThrown) {
+        $.each(rows, function (index, $row) {
+          horizon.datatables.update_row_failed($table, $row, jqXHR.status);
+        });
+      },
+      success: function (data, textStatus, jqXHR) {
+        // None of the rows have changed.
+        if (jqXHR.status === 304) {
+          return;
+        }
+        $.each(rows, function (index, $row) {
+          var obj_id = $row.attr('data-object-id');
+          if (data.rows.hasOwnProperty(obj_id)) {
+            horizon.datatables.replace_row($table, $row, data.rows[obj_id]);
+          } else if ($.inArray(obj_id, data.unchanged) === -1) {
+            horizon.datatables.update_row_failed($table, $row,
+                                                 data.errors[obj_id]);
+          }
+        });
+      },
+      complete: function (jqXHR, textStatus) {
+        // Revalidate the button check for the updated table
+        horizon.datatables.validate_button();
+      }
+    });
+  },
+
+  update_row_failed: function ($table, $row, status) {
+    switch (status) {
+      // A 404 indicates the object is gone, and should be removed from the table
+      case 404:
+        // Update the footer count and reset to default empty row if needed
+        var $footer, row_count, footer_text, colspan, template, params, $empty_row;
+
+        // existing count minus one for the row we're removing
+        horizon.datatables.update_footer_count($table, -1);
+
+        if(row_count === 0) {
+          colspan = $table.find('th[colspan]').attr('colspan');
+          template = horizon.templates.compiled_templates["#empty_row_template"];
+          params = {"colspan": colspan};
+          empty_row = template.render(params);
+          $row.replaceWith(empty_row);
+        } else {
+          $row.remove();
+        }
+        // Reset tablesorter's data cache.
+        $table.trigger("update");
+        break;
+      default:
+        horizon.utils.log(gettext("An error occurred while updating."));
+        $row.removeClass("ajax-update");
+        $row.find("i.ajax-updating").remove();
+        break;
+    }
+  },
+
+  replace_row: function ($table, $row, data) {
+    var $new_row = $(data);
+
+    if ($new_row.hasClass('status_unknown')) {
+      var spinner_elm = $new_row.find("td.status_unknown:last");
+
+      if ($new_row.find('a.btn-action-required').length > 0) {
+        spinner_elm.prepend(
+             $("<div />")
+             .addClass("action_required_img")
+             .append(
+                 $("<img />")
+                 .attr("src", "/static/dashboard/img/action_required.png")));
+      } else {
+        // Replacing spin.js here with an animated gif to reduce CPU
+        spinner_elm.prepend(
+             $("<div />")
+             .addClass("loading_gif")
+             .append(
+                 $("<img />")
+                 .attr("src", "/static/dashboard/img/loading.gif")));
+      }
+    }
+
+    // Only replace row if the html content has changed
+    if($new_row.html() != $row.html()) {
+      if($row.find(':checkbox').is(':checked')) {
+        // Preserve the checkbox if it's already clicked
+        $new_row.find(':checkbox').prop('checked', true);
+      }
+      $row.replaceWith($new_row);
+      // Reset tablesorter's data cache.
+      $table.trigger("update");
+      // Reset decay constant.
+      $table.removeAttr('decay_constant');
+    } else {
+      // Remember the latest etag even if the markup is unchanged.
+      $row.attr('data-update-etag', $new_row.attr('data-update-etag'));
+    }
+  },
+
   validate_button: function () {
     // Disable form button if checkbox are not checked
     $("form").each(function (i) {
@@ -16,14 +16,18 @@
 
 from collections import defaultdict
 import logging
+from multiprocessing.pool import ThreadPool
 import new
+import sys
 
 from django.conf import settings
 from django.core import urlresolvers
 from django import shortcuts
 from django.utils.functional import Promise
+from django.utils import translation
 from django.utils.translation import ugettext_lazy as _
 
+from horizon import conf
 from horizon import exceptions
 from horizon import messages
 from horizon.utils import functions
@@ -38,11 +42,20 @@ STRING_SEPARATOR = "__"
 
 
 class BaseAction(html.HTMLElement):
-    """ Common base class for all ``Action`` classes. """
+    """ Common base class for all ``Action`` classes.
+
+    .. attribute:: datum_independent
+
+        Boolean value indicating that :meth:`allowed` gives the same answer
+        for every row of a table. When ``True`` it is only called for the
+        first row and its result is reused for the rest of the table.
+        Defaults to ``False``.
+    """
     table = None
     handles_multiple = False
     requires_input = False
     preempt = False
+    datum_independent = False
 
     def __init__(self, datum=None):
         super(BaseAction, self).__init__()
@@ -340,6 +353,13 @@ class FilterAction(BaseAction):
         If True, the filter function will be called for the initial
         GET request with an empty ``filter_string``, regardless of the
         value of ``method``.
+
+    Filters which the underlying API supports can be pushed down to it by
+    overriding :meth:`~horizon.tables.FilterAction.api_filter`. The view
+    then gets the filter from
+    :meth:`~horizon.tables.DataTable.get_api_filter` before loading the
+    table's data, and :meth:`~horizon.tables.FilterAction.filter` is only
+    used when the filter isn't pushed down.
     """
     # TODO(gabriel): The method for a filter action should be a GET,
     # but given the form structure of the table that's currently impossible.
@@ -400,6 +420,15 @@ class FilterAction(BaseAction):
         raise NotImplementedError("The filter method has not been "
                                   "implemented by %s." % self.__class__)
 
+    def api_filter(self, table, filter_string):
+        """ Returns the filter to pass on to the API for ``filter_string``.
+
+        Override this to return a dictionary of API filter arguments if
+        the table's data can be filtered by the API. The default, ``None``,
+        means the data is filtered in Python.
+        """
+        return None
+
 
 class FixedFilterAction(FilterAction):
     """ A filter action with fixed buttons.
@@ -486,8 +515,19 @@ class BatchAction(Action):
 
        Optional location to redirect after completion of the delete
        action. Defaults to the current page.
+
+    .. attribute:: concurrency
+
+       Optional maximum number of objects to run :meth:`action` on at once,
+       using a pool of worker threads. Permissions are still checked for
+       every object before any action is taken, and the results are reported
+       in the order the objects were selected. Only enable it for actions
+       whose :meth:`action` doesn't rely on state set by :meth:`allowed`.
+       Defaults to the ``batch_action_concurrency`` key of
+       ``HORIZON_CONFIG``, which is ``1`` (one object at a time).
     """
     success_url = None
+    concurrency = None
 
     def __init__(self):
         self.current_present_action = 0
@@ -554,20 +594,57 @@ class BatchAction(Action):
             return self.success_url
         return request.get_full_path()
 
+    def get_concurrency(self):
+        """
+        Returns the maximum number of objects to run the action on at once.
+        """
+        if self.concurrency is not None:
+            return self.concurrency
+        return conf.HORIZON_CONFIG['batch_action_concurrency']
+
+    def _call_action(self, request, datum_id):
+        """
+        Runs the action on a single object, returning the exception info if
+        it failed so it can be handled later in the requesting thread.
+        """
+        try:
+            self.action(request, datum_id)
+        except Exception:
+            return sys.exc_info()
+        return None
+
+    def _call_actions(self, request, datum_ids, concurrency):
+        """
+        Runs the action on each of the objects using a pool of at most
+        ``concurrency`` threads and returns the outcomes in the same order.
+        """
+        language = translation.get_language()
+
+        def call_action(datum_id):
+            translation.activate(language)
+            try:
+                return self._call_action(request, datum_id)
+            finally:
+                translation.deactivate()
+
+        pool = ThreadPool(min(concurrency, len(datum_ids)))
+        try:
+            return pool.map(call_action, datum_ids)
+        finally:
+            pool.close()
+            pool.join()
+
     def handle(self, table, request, obj_ids):
         action_success = []
         action_failure = []
         action_not_allowed = []
-        for datum_id in obj_ids:
-            datum = table.get_object_by_id(datum_id)
-            datum_display = table.get_object_display(datum) or _("N/A")
-            if not table._filter_action(self, request, datum):
-                action_not_allowed.append(datum_display)
-                LOG.info('Permission denied to %s: "%s"' %
-                         (self._conjugate(past=True).lower(), datum_display))
-                continue
+        concurrency = self.get_concurrency()
+        pending = []
+
+        def record_outcome(datum_id, datum, datum_display, exc_info):
             try:
-                self.action(request, datum_id)
+                if exc_info:
+                    raise exc_info[0], exc_info[1], exc_info[2]
                 #Call update to invoke changes if needed
                 self.update(request, datum)
                 action_success.append(datum_display)
@@ -585,6 +662,27 @@ class BatchAction(Action):
                     action_failure.append(datum_display)
                 exceptions.handle(request, ignore=ignore)
 
+        for datum_id in obj_ids:
+            datum = table.get_object_by_id(datum_id)
+            datum_display = table.get_object_display(datum) or _("N/A")
+            if not table._filter_action(self, request, datum):
+                action_not_allowed.append(datum_display)
+                LOG.info('Permission denied to %s: "%s"' %
+                         (self._conjugate(past=True).lower(), datum_display))
+                continue
+            if concurrency > 1:
+                pending.append((datum_id, datum, datum_display))
+            else:
+                exc_info = self._call_action(request, datum_id)
+                record_outcome(datum_id, datum, datum_display, exc_info)
+
+        if pending:
+            datum_ids = [item[0] for item in pending]
+            outcomes = self._call_actions(request, datum_ids, concurrency)
+            for (datum_id, datum, datum_display), exc_info in zip(pending,
+                                                                  outcomes):
+                record_outcome(datum_id, datum, datum_display, exc_info)
+
         # Begin with success message class, downgrade to info if problems.
         success_message_level = messages.success
         if action_not_allowed:
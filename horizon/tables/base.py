@@ -16,6 +16,8 @@
 
 import collections
 import copy
+import hashlib
+import json
 import logging
 from operator import attrgetter
 import sys
@@ -24,10 +26,13 @@ from django.conf import settings
 from django.core import urlresolvers
 from django import forms
 from django.http import HttpResponse
+from django.http import HttpResponseNotModified
 from django import template
 from django.template.defaultfilters import truncatechars
 from django.template.loader import render_to_string
 from django.utils.datastructures import SortedDict
+from django.utils.encoding import force_unicode
+from django.utils.html import conditional_escape
 from django.utils.html import escape
 from django.utils import http
 from django.utils.http import urlencode
@@ -46,6 +51,29 @@ from horizon.utils import html
 LOG = logging.getLogger(__name__)
 PALETTE = termcolors.PALETTES[termcolors.DEFAULT_PALETTE]
 STRING_SEPARATOR = "__"
+# Mark where the rows and the table go when rendering for streaming.
+STREAM_PLACEHOLDER = "<!-- horizon:table-rows -->"
+TABLE_PLACEHOLDER = "<!-- horizon:table -->"
+# Marks the per-row values in cached row action markup.
+ROW_ACTION_TOKEN = u"\x00%s\x00"
+# Marks the values missing from a column store.
+_MISSING = object()
+
+
+def _json_value(value):
+    """ Coerces a column's display data to a JSON serializable value. """
+    if value is None or isinstance(value, (bool, int, long, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    return force_unicode(value)
+
+
+def _unicode_id(obj_id):
+    """ Coerces an object id to unicode so ids can be compared reliably. """
+    if not isinstance(obj_id, unicode):
+        obj_id = unicode(str(obj_id), 'utf-8')
+    return obj_id
 
 
 class Column(html.HTMLElement):
@@ -232,6 +260,7 @@ class Column(html.HTMLElement):
         if status_choices:
             self.status_choices = status_choices
         self.display_choices = display_choices
+        self._reset_compiled()
 
         if summation is not None and summation not in self.summation_methods:
             raise ValueError("Summation method %s must be one of %s."
@@ -255,12 +284,60 @@ class Column(html.HTMLElement):
     def __repr__(self):
         return '<%s: %s>' % (self.__class__.__name__, self.name)
 
+    def _reset_compiled(self):
+        """
+        Discards the accessors and display choice lookup compiled for this
+        column. Called for every copy of the column bound to a table.
+        """
+        self._accessors = {}
+        self._compiled_choices = (None, {})
+
+    def _compile_accessor(self, datum):
+        """
+        Returns a function which fetches this column's raw data from objects
+        of the same type as ``datum``, skipping the checks ``_lookup`` makes
+        for every object. Objects for which the compiled lookup fails, such
+        as those missing an optional attribute, go through ``_lookup``.
+        """
+        transform = self.transform
+        lookup = self._lookup
+        if callable(transform):
+            return transform
+        if hasattr(datum, transform):
+            def get_attribute(datum):
+                try:
+                    return getattr(datum, transform)
+                except Exception:
+                    return lookup(datum)
+            return get_attribute
+        if isinstance(datum, dict):
+            def get_item(datum):
+                try:
+                    return datum[transform]
+                except Exception:
+                    return lookup(datum)
+            return get_item
+        return lookup
+
     def get_raw_data(self, datum):
         """
         Returns the raw data for this column, before any filters or formatting
         are applied to it. This is useful when doing calculations on data in
         the table.
         """
+        data_type = type(datum)
+        try:
+            accessor = self._accessors[data_type]
+        except KeyError:
+            accessor = self._compile_accessor(datum)
+            self._accessors[data_type] = accessor
+        return accessor(datum)
+
+    def _lookup(self, datum):
+        """
+        Looks up the raw data for this column on ``datum`` without relying on
+        a compiled accessor.
+        """
         # Callable transformations
         if callable(self.transform):
             data = self.transform(datum)
@@ -289,20 +366,21 @@ class Column(html.HTMLElement):
         method for this column.
         """
         datum_id = self.table.get_object_id(datum)
+        data_cache = self.table._data_cache
 
-        if datum_id in self.table._data_cache[self]:
-            return self.table._data_cache[self][datum_id]
+        data = data_cache.get(self, datum_id, _MISSING)
+        if data is not _MISSING:
+            return data
 
         data = self.get_raw_data(datum)
-        display_value = None
-
-        if self.display_choices:
-            display_value = [display for (value, display) in
-                             self.display_choices
-                             if value.lower() == (data or '').lower()]
-
-        if display_value:
-            data = display_value[0]
+        if self.summation:
+            # Keep the raw value around for the summary row.
+            self.table._raw_data_cache.set(self, datum_id, data)
+        display_choices = self._get_display_choices()
+        choice = (data or '').lower() if display_choices else None
+
+        if choice in display_choices:
+            data = display_choices[choice]
         else:
             for filter_func in self.filters:
                 data = filter_func(data)
@@ -310,9 +388,23 @@ class Column(html.HTMLElement):
         if data and self.truncate:
             data = truncatechars(data, self.truncate)
 
-        self.table._data_cache[self][datum_id] = data
+        data_cache.set(self, datum_id, data)
 
-        return self.table._data_cache[self][datum_id]
+        return data
+
+    def _get_display_choices(self):
+        """
+        Returns ``display_choices`` as a dict keyed on the lowercased values,
+        rebuilding it only when ``display_choices`` is replaced.
+        """
+        choices, compiled = self._compiled_choices
+        if choices is not self.display_choices:
+            compiled = {}
+            # The first of several matching choices wins.
+            for value, display in reversed(self.display_choices or ()):
+                compiled[value.lower()] = display
+            self._compiled_choices = (self.display_choices, compiled)
+        return compiled
 
     def get_link_url(self, datum):
         """ Returns the final value for the column's ``link`` property.
@@ -340,6 +432,22 @@ class Column(html.HTMLElement):
         except urlresolvers.NoReverseMatch:
             return self.link
 
+    @property
+    def sort_querystring(self):
+        """
+        Returns the query string which requests server-side sorting of the
+        table by this column, toggling the direction if the table is already
+        sorted by it. Returns ``None`` if the table is not paginated on the
+        server or the column can't be sorted.
+        """
+        if not self.table._meta.page_size or not self.sortable or self.auto:
+            return None
+        sort_column, reverse = self.table.get_sort_order()
+        value = self.name
+        if sort_column is self and not reverse:
+            value = "-%s" % value
+        return urlencode({self.table._meta.sort_param: value})
+
     def get_summation(self):
         """
         Returns the summary value for the data in this column if a
@@ -347,21 +455,43 @@ class Column(html.HTMLElement):
         """
         if self.summation not in self.summation_methods:
             return None
+        return self.table.get_summations().get(self.name, None)
 
-        summation_function = self.summation_methods[self.summation]
-        data = [self.get_raw_data(datum) for datum in self.table.data]
-        data = filter(lambda datum: datum is not None, data)
 
-        if len(data):
-            summation = summation_function(data)
-            for filter_func in self.filters:
-                summation = filter_func(summation)
-            return summation
-        else:
-            return None
+class _CompactElement(html.HTMLElement):
+    """
+    An :class:`~horizon.utils.html.HTMLElement` without an instance
+    dictionary, for the objects a table creates for every row or cell.
+    Its ``attrs`` and ``classes`` are only created once they're accessed.
+    """
+    __slots__ = ('_attrs', '_classes')
+
+    def __init__(self):
+        self._attrs = None
+        self._classes = None
+
+    def _get_attrs(self):
+        if self._attrs is None:
+            self._attrs = {}
+        return self._attrs
+
+    def _set_attrs(self, attrs):
+        self._attrs = attrs
 
+    attrs = property(_get_attrs, _set_attrs)
 
-class Row(html.HTMLElement):
+    def _get_classes(self):
+        if self._classes is None:
+            self._classes = []
+        return self._classes
+
+    def _set_classes(self, classes):
+        self._classes = classes
+
+    classes = property(_get_classes, _set_classes)
+
+
+class Row(_CompactElement):
     """ Represents a row in the table.
 
     When iterated, the ``Row`` instance will yield each of its cells.
@@ -377,6 +507,15 @@ class Row(html.HTMLElement):
     ``ajax_poll_interval`` in the ``HORIZON_CONFIG`` dictionary.
     Default: ``2500`` (measured in milliseconds).
 
+    Rows waiting for an update are polled together, with one request per
+    table. Subclasses can define a ``get_data_many`` method to fetch all of
+    their data objects with a single API call rather than one ``get_data``
+    call per row.
+
+    Rows keep their attributes in ``__slots__``, as a table creates one for
+    every object it displays. Subclasses should declare ``__slots__ = ()``
+    too, or each of their rows gets an instance dictionary again.
+
     .. attribute:: table
 
         The table which this row belongs to.
@@ -414,15 +553,31 @@ class Row(html.HTMLElement):
         String that is used for the query parameter key to request AJAX
         updates. Generally you won't need to change this value.
         Default: ``"row_update"``.
+
+    .. attribute:: ajax_batch_action_name
+
+        String that is used for the query parameter key to request AJAX
+        updates of several rows at once. Generally you won't need to change
+        this value. Default: ``"rows_update"``.
+
+    .. attribute:: etag
+
+        A fingerprint of the row's cell values, set when the cells of an
+        AJAX-enabled row are loaded. AJAX updates use it to answer with
+        ``304 Not Modified`` when the row hasn't changed since the client
+        last saw it.
     """
+    __slots__ = ('table', 'datum', 'selected', 'etag', 'id', 'cells')
     ajax = False
     ajax_action_name = "row_update"
+    ajax_batch_action_name = "rows_update"
 
     def __init__(self, table, datum=None):
         super(Row, self).__init__()
         self.table = table
         self.datum = datum
         self.selected = False
+        self.etag = None
         if self.datum:
             self.load_cells()
         else:
@@ -456,10 +611,10 @@ class Row(html.HTMLElement):
                 # Convert value to string to avoid accidental type conversion
                 data = widget.render('object_ids',
                                      unicode(table.get_object_id(datum)))
-                table._data_cache[column][table.get_object_id(datum)] = data
+                table._data_cache.set(column, table.get_object_id(datum), data)
             elif column.auto == "actions":
                 data = table.render_row_actions(datum)
-                table._data_cache[column][table.get_object_id(datum)] = data
+                table._data_cache.set(column, table.get_object_id(datum), data)
             else:
                 data = column.get_data(datum)
             cell = Cell(datum, data, column, self)
@@ -467,13 +622,20 @@ class Row(html.HTMLElement):
         self.cells = SortedDict(cells)
 
         if self.ajax:
+            self.etag = self.get_etag()
             interval = conf.HORIZON_CONFIG['ajax_poll_interval']
             self.attrs['data-update-interval'] = interval
             self.attrs['data-update-url'] = self.get_ajax_update_url()
+            self.attrs['data-update-batch-url'] = \
+                                        self.get_ajax_batch_update_url()
+            self.attrs['data-object-id'] = table.get_object_id(datum)
+            self.attrs['data-update-etag'] = self.etag
             self.classes.append("ajax-update")
 
         # Add the row's status class and id to the attributes to be rendered.
-        self.classes.append(self.status_class)
+        status_class = self.status_class
+        if status_class:
+            self.classes.append(status_class)
         id_vals = {"table": self.table.name,
                    "sep": STRING_SEPARATOR,
                    "id": table.get_object_id(datum)}
@@ -522,6 +684,23 @@ class Row(html.HTMLElement):
                             "obj_id": self.table.get_object_id(self.datum)})
         return "%s?%s" % (table_url, params)
 
+    def get_etag(self):
+        """
+        Returns a fingerprint of the values of the row's cells, which
+        changes whenever the rendered content of the row would.
+        """
+        fingerprint = hashlib.md5()
+        for name, cell in self.cells.items():
+            value = u"%s\x00%s\x00" % (name, cell.data)
+            fingerprint.update(value.encode("utf-8"))
+        return fingerprint.hexdigest()
+
+    def get_ajax_batch_update_url(self):
+        table_url = self.table.get_absolute_url()
+        params = urlencode({"table": self.table.name,
+                            "action": self.ajax_batch_action_name})
+        return "%s?%s" % (table_url, params)
+
     def get_data(self, request, obj_id):
         """
         Fetches the updated data for the row based on the object id
@@ -530,13 +709,37 @@ class Row(html.HTMLElement):
         raise NotImplementedError("You must define a get_data method on %s"
                                   % self.__class__.__name__)
 
+    def get_data_many(self, request, obj_ids):
+        """
+        Fetches the updated data for several rows at once based on the
+        object ids passed in, returning a dict which maps each of the ids
+        to its data object. Ids missing from the dict are treated as objects
+        which no longer exist.
 
-class Cell(html.HTMLElement):
+        By default this calls :meth:`~horizon.tables.Row.get_data` for each
+        id. Override it to fetch the objects with a single API call.
+        """
+        data = {}
+        for obj_id in obj_ids:
+            try:
+                data[obj_id] = self.get_data(request, obj_id)
+            except Exception:
+                error = exceptions.handle(request, ignore=True)
+                if error is not exceptions.NotFound:
+                    raise
+        return data
+
+
+class Cell(_CompactElement):
     """ Represents a single cell in the table. """
+    __slots__ = ('datum', 'data', 'column', 'row', '_status')
+
     def __init__(self, datum, data, column, row, attrs=None, classes=None):
-        self.classes = classes or getattr(self, "classes", [])
         super(Cell, self).__init__()
-        self.attrs.update(attrs or {})
+        if classes:
+            self.classes = classes
+        if attrs:
+            self.attrs.update(attrs)
 
         self.datum = datum
         self.data = data
@@ -624,6 +827,75 @@ class Cell(html.HTMLElement):
         return list(classes)
 
 
+class _ColumnStore(object):
+    """
+    Holds a value per column for the rows of a table. The values of each
+    column are kept in a list addressed by the row's index, and a single
+    dictionary maps the object ids to row indexes for all of the columns.
+    """
+    __slots__ = ('_rows', '_columns')
+
+    def __init__(self, columns, rows=None):
+        self._rows = {} if rows is None else rows
+        self._columns = dict([(column, []) for column in columns])
+
+    def get(self, column, obj_id, default=None):
+        index = self._rows.get(obj_id, None)
+        if index is not None:
+            values = self._columns[column]
+            if index < len(values) and values[index] is not _MISSING:
+                return values[index]
+        return default
+
+    def set(self, column, obj_id, value):
+        index = self._rows.setdefault(obj_id, len(self._rows))
+        values = self._columns[column]
+        if index >= len(values):
+            values.extend([_MISSING] * (index + 1 - len(values)))
+        values[index] = value
+
+
+class _StreamedRows(object):
+    """
+    Stands in for the list of rows while the table template is rendered for
+    streaming: it has the length of the real rows but yields a single
+    placeholder which is later replaced by the rendered rows.
+    """
+    def __init__(self, data):
+        self.length = len(data or [])
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        if self.length:
+            yield self
+
+    def render(self):
+        return mark_safe(STREAM_PLACEHOLDER)
+
+
+def _has_bound_url(action):
+    """ Returns whether a bound row action links to a URL of its own. """
+    return isinstance(action, LinkAction) or hasattr(action, "bound_url")
+
+
+class _RowActionPlaceholder(object):
+    """
+    Stands in for a bound row action while the row actions markup is
+    rendered for caching: the values which differ from row to row are
+    rendered as tokens to be substituted for each row.
+    """
+    def __init__(self, action, index):
+        self._action = action
+        self.attr_string = ROW_ACTION_TOKEN % ("attrs_%s" % index)
+        if _has_bound_url(action):
+            self.bound_url = ROW_ACTION_TOKEN % ("url_%s" % index)
+
+    def __getattr__(self, attr):
+        return getattr(self._action, attr)
+
+
 class DataTableOptions(object):
     """ Contains options for :class:`.DataTable` objects.
 
@@ -686,6 +958,21 @@ class DataTableOptions(object):
         view this will need to be changed to differentiate between the
         tables. Default: ``"marker"``.
 
+    .. attribute:: sort_param
+
+        The name of the query string parameter which will be used to
+        request server-side sorting of this table. Its value is the name of
+        a sortable column, prefixed with ``"-"`` for descending order.
+        Default: ``"sort"``.
+
+    .. attribute:: page_size
+
+        The maximum number of rows to render at once. When set, the
+        filtered and sorted data is sliced to a window starting after the
+        object identified by the ``pagination_param`` marker before any rows
+        are built, and a link to the next window is shown in the footer.
+        Default: ``None`` (all rows are rendered).
+
     .. attribute:: status_columns
 
         A list or tuple of column names which represents the "state"
@@ -747,6 +1034,8 @@ class DataTableOptions(object):
         self.row_class = getattr(options, 'row_class', Row)
         self.column_class = getattr(options, 'column_class', Column)
         self.pagination_param = getattr(options, 'pagination_param', 'marker')
+        self.sort_param = getattr(options, 'sort_param', 'sort')
+        self.page_size = getattr(options, 'page_size', None)
         self.browser_table = getattr(options, 'browser_table', None)
         self.footer = getattr(options, 'footer', True)
         self.no_data_message = getattr(options,
@@ -901,6 +1190,12 @@ class DataTable(object):
         the :meth:`~horizon.tables.FilterAction.filter` method of the table's
         :class:`~horizon.tables.FilterAction` class (if one is provided)
         using the current request's query parameters.
+
+    .. attribute:: page_data
+
+        Read-only access to the filtered data, sorted and sliced to the
+        current page according to the table's ``sort_param`` and
+        ``page_size`` options. These are the objects rows are built for.
     """
     __metaclass__ = DataTableMetaclass
 
@@ -912,6 +1207,11 @@ class DataTable(object):
         self._no_data_message = self._meta.no_data_message
         self.breadcrumb = None
         self.current_item_id = None
+        self._streaming = False
+        self._render_deferred = False
+        self._api_filtered = False
+        self._allowed_actions = {}
+        self._row_actions_cache = {}
         self.permissions = self._meta.permissions
 
         # Create a new set
@@ -919,6 +1219,7 @@ class DataTable(object):
         for key, _column in self._columns.items():
             column = copy.copy(_column)
             column.table = self
+            column._reset_compiled()
             columns.append((key, column))
         self.columns = SortedDict(columns)
         self._populate_data_cache()
@@ -940,6 +1241,19 @@ class DataTable(object):
     def name(self):
         return self._meta.name
 
+    def _get_data(self):
+        return self._data
+
+    def _set_data(self, data):
+        self._data = data
+        # Anything previously derived from the data refers to the old dataset.
+        self._object_index = None
+        for attr in ('_filtered_data', '_page_data', '_summations'):
+            if hasattr(self, attr):
+                delattr(self, attr)
+
+    data = property(_get_data, _set_data)
+
     @property
     def footer(self):
         return self._meta.footer
@@ -952,7 +1266,8 @@ class DataTable(object):
     def filtered_data(self):
         if not hasattr(self, '_filtered_data'):
             self._filtered_data = self.data
-            if self._meta.filter and self._meta._filter_action:
+            if self._meta.filter and self._meta._filter_action \
+                    and not self._api_filtered:
                 action = self._meta._filter_action
                 filter_string = self.get_filter_string()
                 request_method = self.request.method
@@ -971,17 +1286,133 @@ class DataTable(object):
                                                             filter_string)
         return self._filtered_data
 
+    @property
+    def page_data(self):
+        """
+        The filtered data sorted according to the ``sort_param`` query
+        parameter and, if ``page_size`` is set, sliced to the current page.
+        """
+        if not hasattr(self, '_page_data'):
+            self._has_more_page_data = False
+            data = self.filtered_data
+            column, reverse = self.get_sort_order()
+            if column is not None:
+                data = self.sort_data(data, column, reverse)
+            page_size = self._meta.page_size
+            if page_size and data:
+                data = list(data)
+                start = self._get_page_start(data)
+                self._has_more_page_data = len(data) > start + page_size
+                data = data[start:start + page_size]
+            self._page_data = data
+        return self._page_data
+
+    def get_sort_order(self):
+        """
+        Returns a tuple of the column requested through the ``sort_param``
+        query parameter and whether the order is descending. The column is
+        ``None`` if no valid sortable column was requested.
+        """
+        value = self.request.GET.get(self._meta.sort_param, '')
+        reverse = value.startswith('-')
+        column = self.columns.get(value.lstrip('-'), None)
+        if column is None or column.auto or not column.sortable:
+            return None, False
+        return column, reverse
+
+    def sort_data(self, data, column, reverse=False):
+        """
+        Returns the data sorted by the raw values of the given column.
+        Empty values sort first and strings are compared case-insensitively.
+        """
+        def sort_key(datum):
+            value = column.get_raw_data(datum)
+            if isinstance(value, basestring):
+                value = value.lower()
+            return (value is not None, value)
+        return sorted(data or [], key=sort_key, reverse=reverse)
+
+    def _get_page_start(self, data):
+        marker = self.request.GET.get(self._meta.pagination_param, None)
+        if marker:
+            marker = _unicode_id(marker)
+            for position, datum in enumerate(data):
+                if _unicode_id(self.get_object_id(datum)) == marker:
+                    return position + 1
+        # The marker may already have been consumed by the API call which
+        # loaded this data, in which case the window starts at the top.
+        return 0
+
     def get_filter_string(self):
         filter_action = self._meta._filter_action
         param_name = filter_action.get_param_name()
         filter_string = self.request.POST.get(param_name, '')
         return filter_string
 
+    def get_api_filter(self):
+        """
+        Returns the API filter for the current filter string as given by
+        the filter action's :meth:`~horizon.tables.FilterAction.api_filter`,
+        or ``None`` if there is nothing to push down to the API.
+
+        This is meant to be called by the data loading code of a view
+        before making its API call. Once a filter has been returned the
+        caller is expected to apply it, and the table no longer filters
+        its data in Python.
+        """
+        action = self._meta._filter_action
+        if not self._meta.filter or not action:
+            return None
+        filter_string = self.get_filter_string()
+        if not filter_string or self.request.method != action.method:
+            return None
+        api_filter = action.api_filter(self, filter_string)
+        if api_filter is not None:
+            self._api_filtered = True
+        return api_filter
+
     def _populate_data_cache(self):
-        self._data_cache = {}
-        # Set up hash tables to store data points for each column
-        for column in self.get_columns():
-            self._data_cache[column] = {}
+        # Set up the stores for the data points of each column, sharing
+        # the index of the rows.
+        columns = self.get_columns()
+        self._data_cache = _ColumnStore(columns)
+        self._raw_data_cache = _ColumnStore(columns,
+                                            rows=self._data_cache._rows)
+
+    def get_summations(self):
+        """
+        Returns a dictionary mapping the names of the columns which specify
+        a valid ``summation`` to their summary values.
+
+        All of the columns are summarized in a single pass over the table's
+        data, reusing the raw values fetched while the rows were built.
+        Columns without any data are left out.
+        """
+        columns = [column for column in self.columns.values()
+                   if column.summation in column.summation_methods]
+        # Changing a column's summation method invalidates the results.
+        methods = [(column.name, column.summation) for column in columns]
+        if getattr(self, '_summations', (None, None))[0] != methods:
+            raw_cache = self._raw_data_cache
+            accumulators = [(column, []) for column in columns]
+            for datum in self.data or []:
+                datum_id = self.get_object_id(datum)
+                for column, values in accumulators:
+                    value = raw_cache.get(column, datum_id, _MISSING)
+                    if value is _MISSING:
+                        value = column.get_raw_data(datum)
+                    if value is not None:
+                        values.append(value)
+            summations = {}
+            for column, values in accumulators:
+                if values:
+                    method = column.summation_methods[column.summation]
+                    summation = method(values)
+                    for filter_func in column.filters:
+                        summation = filter_func(summation)
+                    summations[column.name] = summation
+            self._summations = (methods, summations)
+        return self._summations[1]
 
     def _filter_action(self, action, request, datum=None):
         try:
@@ -989,11 +1420,20 @@ class DataTable(object):
             row_matched = True
             if self._meta.mixed_data_type:
                 row_matched = action.data_type_matched(datum)
-            return action._allowed(request, datum) and row_matched
+            return self._is_allowed(action, request, datum) and row_matched
         except Exception:
             LOG.exception("Error while checking action permissions.")
             return None
 
+    def _is_allowed(self, action, request, datum):
+        # Actions which don't depend on the datum are checked only once.
+        if datum is None or not action.datum_independent:
+            return action._allowed(request, datum)
+        if action.name not in self._allowed_actions:
+            allowed = action._allowed(request, datum)
+            self._allowed_actions[action.name] = allowed
+        return self._allowed_actions[action.name]
+
     def is_browser_table(self):
         if self._meta.browser_table:
             return True
@@ -1001,11 +1441,47 @@ class DataTable(object):
 
     def render(self):
         """ Renders the table using the template from the table options. """
+        if self._render_deferred:
+            # The table will be streamed into the page in place of this.
+            return mark_safe(TABLE_PLACEHOLDER)
         table_template = template.loader.get_template(self._meta.template)
         extra_context = {self._meta.context_var_name: self}
         context = template.RequestContext(self.request, extra_context)
         return table_template.render(context)
 
+    def render_stream(self, chunk_size=50):
+        """
+        Renders the table using the template from the table options as a
+        generator of strings rather than a single string.
+
+        The markup up to the first row is yielded as soon as it has been
+        rendered, followed by the rows in chunks of ``chunk_size`` built as
+        they are needed, then the rest of the table. Memory use and the time
+        until the first chunk is available do not depend on the number
+        of rows.
+        """
+        self._streaming = True
+        try:
+            markup = self.render()
+        finally:
+            self._streaming = False
+        head, placeholder, tail = markup.partition(STREAM_PLACEHOLDER)
+        yield head
+        if placeholder:
+            chunk = []
+            try:
+                for row in self._iter_rows():
+                    chunk.append(row.render())
+                    if len(chunk) >= chunk_size:
+                        yield u"".join(chunk)
+                        chunk = []
+            except Exception:
+                LOG.exception("Error while rendering table rows.")
+                raise
+            if chunk:
+                yield u"".join(chunk)
+            yield tail
+
     def get_absolute_url(self):
         """ Returns the canonical URL for this table.
 
@@ -1023,6 +1499,30 @@ class DataTable(object):
         """ Returns the message to be displayed when there is no data. """
         return self._no_data_message
 
+    def _get_object_index(self):
+        """
+        Returns a tuple of two dicts mapping the unicode ids of the objects in
+        the table's dataset to the objects themselves. The first contains the
+        ids which are unique, the second lists every match for the ids which
+        are not.
+
+        The index is built on first use and discarded whenever ``data``
+        is reassigned.
+        """
+        if self._object_index is None:
+            index = {}
+            duplicates = {}
+            for datum in self.data or []:
+                obj_id = _unicode_id(self.get_object_id(datum))
+                if obj_id in duplicates:
+                    duplicates[obj_id].append(datum)
+                elif obj_id in index:
+                    duplicates[obj_id] = [index.pop(obj_id), datum]
+                else:
+                    index[obj_id] = datum
+            self._object_index = (index, duplicates)
+        return self._object_index
+
     def get_object_by_id(self, lookup):
         """
         Returns the data object from the table's dataset which matches
@@ -1032,25 +1532,19 @@ class DataTable(object):
         We will convert the object id and ``lookup`` to unicode before
         comparison.
 
-        Uses :meth:`~horizon.tables.DataTable.get_object_id` internally.
-        """
-        if not isinstance(lookup, unicode):
-            lookup = unicode(str(lookup), 'utf-8')
-        matches = []
-        for datum in self.data:
-            obj_id = self.get_object_id(datum)
-            if not isinstance(obj_id, unicode):
-                obj_id = unicode(str(obj_id), 'utf-8')
-            if obj_id == lookup:
-                matches.append(datum)
-        if len(matches) > 1:
+        Uses :meth:`~horizon.tables.DataTable.get_object_id` internally,
+        through an index of the dataset which is built once per ``data``.
+        """
+        lookup = _unicode_id(lookup)
+        index, duplicates = self._get_object_index()
+        if lookup in duplicates:
             raise ValueError("Multiple matches were returned for that id: %s."
-                           % matches)
-        if not matches:
+                           % duplicates[lookup])
+        if lookup not in index:
             raise exceptions.Http302(self.get_absolute_url(),
                                      _('No match returned for the id "%s".')
                                        % lookup)
-        return matches[0]
+        return index[lookup]
 
     @property
     def has_actions(self):
@@ -1117,14 +1611,47 @@ class DataTable(object):
     def render_row_actions(self, datum):
         """
         Renders the actions specified in ``Meta.row_actions`` using the
-        current row data. """
+        current row data.
+
+        The markup is rendered once for each distinct set of allowed actions
+        and verbose names; the row id, URLs and HTML attributes of each row
+        are substituted into it.
+        """
+        bound_actions = self.get_row_actions(datum)
+        signature = tuple([self._get_row_action_signature(action)
+                           for action in bound_actions])
+        if signature not in self._row_actions_cache:
+            markup = self._render_row_actions_markup(bound_actions)
+            self._row_actions_cache[signature] = markup
+        markup = self._row_actions_cache[signature]
+        replacements = [(ROW_ACTION_TOKEN % "row_id",
+                         conditional_escape(self.get_object_id(datum)))]
+        for index, action in enumerate(bound_actions):
+            replacements.append((ROW_ACTION_TOKEN % ("attrs_%s" % index),
+                                 action.attr_string))
+            # Only link actions have a URL; the others submit the form.
+            if _has_bound_url(action):
+                replacements.append((ROW_ACTION_TOKEN % ("url_%s" % index),
+                                     conditional_escape(action.bound_url)))
+        for token, value in replacements:
+            markup = markup.replace(token, value)
+        return mark_safe(markup)
+
+    def _get_row_action_signature(self, action):
+        verbose_name = action.verbose_name
+        if callable(verbose_name):
+            verbose_name = verbose_name()
+        return (action.name, action.method, unicode(verbose_name))
+
+    def _render_row_actions_markup(self, bound_actions):
         template_path = self._meta.row_actions_template
         row_actions_template = template.loader.get_template(template_path)
-        bound_actions = self.get_row_actions(datum)
-        extra_context = {"row_actions": bound_actions,
-                         "row_id": self.get_object_id(datum)}
+        placeholders = [_RowActionPlaceholder(action, index)
+                        for index, action in enumerate(bound_actions)]
+        extra_context = {"row_actions": placeholders,
+                         "row_id": ROW_ACTION_TOKEN % "row_id"}
         context = template.RequestContext(self.request, extra_context)
-        return row_actions_template.render(context)
+        return unicode(row_actions_template.render(context))
 
     @staticmethod
     def parse_action(action_string):
@@ -1215,7 +1742,46 @@ class DataTable(object):
                     error = exceptions.handle(request, ignore=True)
                 if request.is_ajax():
                     if not error:
-                        return HttpResponse(new_row.render())
+                        etags = http.parse_etags(
+                                request.META.get("HTTP_IF_NONE_MATCH", ""))
+                        if new_row.etag in etags:
+                            return HttpResponseNotModified()
+                        response = HttpResponse(new_row.render())
+                        response["ETag"] = http.quote_etag(new_row.etag)
+                        return response
+                    else:
+                        return HttpResponse(status=error.status_code)
+            elif new_row.ajax and \
+                    new_row.ajax_batch_action_name == action_name:
+                obj_ids = request.GET.getlist("obj_id")
+                # The etags the client last saw, in the same order as ids.
+                etags = dict(zip(obj_ids, request.GET.getlist("etag")))
+                try:
+                    data = new_row.get_data_many(request, obj_ids)
+                    rows = {}
+                    unchanged = []
+                    errors = {}
+                    for obj_id in obj_ids:
+                        if obj_id in data:
+                            row = self._meta.row_class(self, data[obj_id])
+                            if etags.get(obj_id) == row.etag:
+                                unchanged.append(obj_id)
+                            else:
+                                rows[obj_id] = row.render()
+                        else:
+                            errors[obj_id] = exceptions.NotFound.status_code
+                    error = False
+                except Exception:
+                    error = exceptions.handle(request, ignore=True)
+                if request.is_ajax():
+                    if not error:
+                        if not rows and not errors:
+                            return HttpResponseNotModified()
+                        content = json.dumps({"rows": rows,
+                                              "unchanged": unchanged,
+                                              "errors": errors})
+                        return HttpResponse(content,
+                                            content_type="application/json")
                     else:
                         return HttpResponse(status=error.status_code)
 
@@ -1277,18 +1843,34 @@ class DataTable(object):
         The method is largely meant for internal use, but if you want to
         override it to provide custom behavior you can do so at your own risk.
         """
+        if self._meta.page_size and self.page_data and \
+                self._has_more_page_data:
+            return True
         return self._meta.has_more_data
 
     def get_marker(self):
         """
         Returns the identifier for the last object in the current data set
         for APIs that use marker/limit-based paging.
+
+        If the table is paginated with ``page_size`` this is the last object
+        of the current page.
         """
-        return http.urlquote_plus(self.get_object_id(self.data[-1]))
+        if self._meta.page_size and self.page_data:
+            datum = self.page_data[-1]
+        else:
+            datum = self.data[-1]
+        return http.urlquote_plus(self.get_object_id(datum))
 
     def get_pagination_string(self):
         """ Returns the query parameter string to paginate this table. """
-        return "=".join([self._meta.pagination_param, self.get_marker()])
+        pagination_string = "=".join([self._meta.pagination_param,
+                                      self.get_marker()])
+        sort_value = self.request.GET.get(self._meta.sort_param, None)
+        if sort_value and self.get_sort_order()[0] is not None:
+            sort_string = urlencode({self._meta.sort_param: sort_value})
+            pagination_string = "&".join([pagination_string, sort_string])
+        return pagination_string
 
     def calculate_row_status(self, statuses):
         """
@@ -1334,16 +1916,32 @@ class DataTable(object):
         """ Returns this table's columns including auto-generated ones."""
         return self.columns.values()
 
+    def _get_current_item(self):
+        """
+        Returns the data object matching ``current_item_id``, or ``None``
+        if it is not set or not present in the table's dataset.
+        """
+        if self.current_item_id is None:
+            return None
+        index = self._get_object_index()[0]
+        return index.get(_unicode_id(self.current_item_id), None)
+
+    def _iter_rows(self):
+        current_item = self._get_current_item()
+        for datum in self.page_data:
+            row = self._meta.row_class(self, datum)
+            if current_item is not None and datum is current_item:
+                self.selected = True
+                row.classes.append('current_selected')
+            yield row
+
     def get_rows(self):
         """ Return the row data for this table broken out by columns. """
-        rows = []
+        if self._streaming:
+            # The rows are rendered separately by render_stream.
+            return _StreamedRows(self.page_data)
         try:
-            for datum in self.filtered_data:
-                row = self._meta.row_class(self, datum)
-                if self.get_object_id(datum) == self.current_item_id:
-                    self.selected = True
-                    row.classes.append('current_selected')
-                rows.append(row)
+            rows = list(self._iter_rows())
         except Exception:
             # Exceptions can be swallowed at the template level here,
             # re-raising as a TemplateSyntaxError makes them visible.
@@ -1351,3 +1949,33 @@ class DataTable(object):
             exc_info = sys.exc_info()
             raise template.TemplateSyntaxError, exc_info[1], exc_info[2]
         return rows
+
+    def get_json_data(self, column_names=None):
+        """
+        Returns the filtered, sorted and paginated data of this table as a
+        dictionary which can be serialized to JSON, without rendering any
+        templates.
+
+        Each row holds the object id and the display data of the table's
+        columns, as returned by :meth:`~horizon.tables.Column.get_data`.
+        Auto-generated columns are left out, and if ``column_names`` is
+        given only the columns named in it are included.
+        """
+        columns = [column for column in self.columns.values()
+                   if not column.auto]
+        if column_names is not None:
+            columns = [column for column in columns
+                       if column.name in column_names]
+        rows = []
+        for datum in self.page_data:
+            cells = dict([(column.name, _json_value(column.get_data(datum)))
+                          for column in columns])
+            rows.append({"id": _json_value(self.get_object_id(datum)),
+                         "cells": cells})
+        data = {"table": self.name,
+                "columns": [column.name for column in columns],
+                "rows": rows,
+                "has_more_data": self.has_more_data()}
+        if data["has_more_data"]:
+            data["marker"] = self.get_marker()
+        return data
@@ -15,11 +15,21 @@
 #    under the License.
 
 from collections import defaultdict
+import json
 
+from django.http import HttpResponse
+from django.http import HttpResponseForbidden
 from django.views import generic
 
+from horizon.tables.base import TABLE_PLACEHOLDER
 from horizon.templatetags.horizon import has_permissions
 
+try:
+    from django.http import StreamingHttpResponse
+except ImportError:
+    # Django < 1.5 streams any HttpResponse built from an iterator.
+    StreamingHttpResponse = HttpResponse
+
 
 class MultiTableMixin(object):
     """ A generic mixin which provides methods for handling DataTables. """
@@ -173,9 +183,25 @@ class DataTableView(MultiTableView):
 
     Optionally, you can override the ``has_more_data`` method to trigger
     pagination handling for APIs that support it.
+
+    Setting the ``streaming`` attribute to ``True`` sends the page as a
+    streaming response: everything up to the table's rows is sent as soon
+    as it is rendered and the rows follow in chunks of ``stream_chunk_size``
+    as they are built, so large tables are never rendered into memory at
+    once.
+
+    Requesting the view with ``?format=json`` returns the table's filtered,
+    sorted and paginated data as JSON instead of the rendered page. An
+    optional ``columns`` query parameter holds a comma-separated list of
+    the column names to include. See
+    :meth:`~horizon.tables.DataTable.get_json_data`.
     """
     table_class = None
     context_object_name = 'table'
+    streaming = False
+    stream_chunk_size = 50
+    format_param = "format"
+    columns_param = "columns"
 
     def _get_data_dict(self):
         if not self._data:
@@ -209,6 +235,48 @@ class DataTableView(MultiTableView):
             context[self.context_object_name] = self.table
         return context
 
+    def get(self, request, *args, **kwargs):
+        if request.GET.get(self.format_param, None) != "json":
+            return super(DataTableView, self).get(request, *args, **kwargs)
+        handled = self.construct_tables()
+        if handled:
+            return handled
+        return self.render_to_json_response()
+
+    def render_to_json_response(self):
+        if not hasattr(self, "table"):
+            return HttpResponseForbidden()
+        column_names = self.request.GET.get(self.columns_param, None)
+        if column_names is not None:
+            column_names = [name.strip() for name in column_names.split(",")]
+        data = self.table.get_json_data(column_names=column_names)
+        return HttpResponse(json.dumps(data), content_type="application/json")
+
+    def render_to_response(self, context, **response_kwargs):
+        response = super(DataTableView, self).render_to_response(
+                                                    context, **response_kwargs)
+        if not self.streaming or not hasattr(self, "table"):
+            return response
+        # Render the page around the table now and stream the table itself.
+        self.table._render_deferred = True
+        try:
+            response.render()
+        finally:
+            self.table._render_deferred = False
+        head, placeholder, tail = response.content.partition(TABLE_PLACEHOLDER)
+        stream = self._stream_page(head, placeholder, tail)
+        return StreamingHttpResponse(stream,
+                                     content_type=response['Content-Type'],
+                                     status=response.status_code)
+
+    def _stream_page(self, head, placeholder, tail):
+        yield head
+        if placeholder:
+            chunk_size = self.stream_chunk_size
+            for chunk in self.table.render_stream(chunk_size=chunk_size):
+                yield chunk.encode('utf-8')
+            yield tail
+
 
 class MixedDataTableView(DataTableView):
     """ A class-based generic view to handle DataTable with mixed data
@@ -16,10 +16,14 @@
 #    under the License.
 
 from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django import http
+from django.test.utils import override_settings
 
 from horizon import exceptions
 from horizon import middleware
 from horizon.test import helpers as test
+from horizon.utils import instrumentation
 
 
 class MiddlewareTests(test.TestCase):
@@ -32,3 +36,24 @@ class MiddlewareTests(test.TestCase):
         resp.client = self.client
 
         self.assertRedirects(resp, url)
+
+    @override_settings(DEBUG=True)
+    def test_api_timing(self):
+        request = self.factory.get('/project/')
+        mw = middleware.ApiTimingMiddleware()
+        mw.process_request(request)
+        for i in range(3):
+            instrumentation.record_call(request, "compute", "servers.get",
+                                        0.01, 1)
+        resp = mw.process_response(request, http.HttpResponse())
+
+        self.assertTrue(resp['Server-Timing'].startswith("total;dur="))
+        self.assertIn('compute;dur=30.0;desc="3 calls"', resp['Server-Timing'])
+        summary = instrumentation.get_recent_requests()[-1]
+        self.assertEqual(summary["path"], '/project/')
+        self.assertEqual(summary["api_calls"], 3)
+        self.assertEqual(summary["repeated_calls"],
+                         [("compute", "servers.get", 3)])
+
+    def test_api_timing_unused_without_debug(self):
+        self.assertRaises(MiddlewareNotUsed, middleware.ApiTimingMiddleware)
@@ -14,6 +14,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+import threading
+
 from django.core.urlresolvers import reverse
 from django import http
 from django import shortcuts
@@ -21,6 +24,7 @@ from django.utils.translation import ugettext_lazy as _
 
 from mox import IsA
 
+from horizon import exceptions
 from horizon import tables
 from horizon.tables import views as table_views
 from horizon.test import helpers as test
@@ -95,6 +99,7 @@ class MyColumn(tables.Column):
 
 
 class MyRow(tables.Row):
+    __slots__ = ()
     ajax = True
 
     @classmethod
@@ -385,6 +390,49 @@ class DataTableTests(test.TestCase):
         row = self.table.get_rows()[0]
         self.assertTrue("down" in row.cells['status'].value)
 
+    def test_table_column_compiled_lookups(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        value_col = self.table.columns['value']
+        self.assertEqual(value_col.get_raw_data(TEST_DATA[0]), 'value_1')
+        self.assertEqual(value_col.get_raw_data({'value': 'dict_value'}),
+                         'dict_value')
+        self.assertEqual(value_col.get_raw_data({'other': 'dict_value'}),
+                         None)
+        # Objects missing an attribute others of their type have
+        missing = FakeObject('4', 'object_4', 'value_4', 'up')
+        del missing.value
+        self.assertEqual(value_col.get_raw_data(missing), None)
+
+        # Display choices are matched case-insensitively, first match wins
+        status_col = self.table.columns['status']
+        status_col.display_choices = (('UP', 'Is Up'), ('up', 'Ignored'))
+        self.assertEqual(status_col.get_data(TEST_DATA[0]), 'Is Up')
+        self.assertEqual(status_col.get_data(TEST_DATA[1]), 'down')
+
+    def test_table_compact_cells(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        row = self.table.get_rows()[0]
+        cell = row.cells['name']
+        self.assertFalse(hasattr(cell, '__dict__'))
+        self.assertFalse(hasattr(tables.Row(self.table), '__dict__'))
+        self.assertFalse(hasattr(row, '__dict__'))
+        # Attributes and classes are only created when they're used
+        self.assertEqual(cell._attrs, None)
+        self.assertEqual(cell._classes, None)
+        self.assertIn('normal_column', cell.attr_string)
+        self.assertEqual(cell.attrs, {})
+
+        # Cell data is stored per column, addressed by row index
+        data_cache = self.table._data_cache
+        name_col = self.table.columns['name']
+        self.assertEqual(data_cache.get(name_col, '3'), 'custom object_3')
+        self.assertEqual(data_cache.get(name_col, '4', 'missing'), 'missing')
+        self.assertEqual(data_cache._rows, {'1': 0, '2': 1, '3': 2})
+        data_cache.set(name_col, '4', None)
+        self.assertEqual(data_cache.get(name_col, '4', 'missing'), None)
+        value_col = self.table.columns['value']
+        self.assertEqual(data_cache.get(value_col, '4', 'missing'), 'missing')
+
     def test_table_row(self):
         self.table = MyTable(self.request, TEST_DATA)
         row = self.table.get_rows()[0]
@@ -446,6 +494,66 @@ class DataTableTests(test.TestCase):
         resp = http.HttpResponse(table_actions)
         self.assertContains(resp, "table_search", 0)
 
+    def test_row_actions_render_cache(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        markup_1 = self.table.render_row_actions(TEST_DATA[0])
+        markup_3 = self.table.render_row_actions(TEST_DATA[2])
+        # Rows with the same allowed actions share the cached markup
+        self.assertEqual(len(self.table._row_actions_cache), 1)
+        self.assertIn("my_table__delete__1", markup_1)
+        resp = http.HttpResponse(markup_3)
+        self.assertContains(resp, "my_table__delete__3", 1)
+        self.assertContains(resp, 'id="my_table__row_3__action_delete"', 1)
+        self.assertNotContains(resp, "\x00")
+
+        # A row with different allowed actions gets its own markup
+        markup_2 = self.table.render_row_actions(TEST_DATA[1])
+        self.assertEqual(len(self.table._row_actions_cache), 2)
+        resp = http.HttpResponse(markup_2)
+        self.assertContains(resp, "<li", 2)
+        self.assertContains(resp, "my_table__toggle__2", 1)
+        self.assertContains(resp, "Up Item", 1)
+        self.assertNotContains(resp, "my_table__delete__2")
+
+    def test_row_actions_render_cache_without_links(self):
+        class TempTable(MyTable):
+            class Meta:
+                name = "my_table"
+                row_actions = (MyAction, MyBatchAction)
+
+        self.table = TempTable(self.request, TEST_DATA)
+        self.table.render_row_actions(TEST_DATA[0])
+        markup = self.table.render_row_actions(TEST_DATA[2])
+        self.assertEqual(len(self.table._row_actions_cache), 1)
+        resp = http.HttpResponse(markup)
+        self.assertContains(resp, "my_table__delete__3", 1)
+        self.assertContains(resp, "my_table__batch__3", 1)
+        self.assertNotContains(resp, "<a href=")
+        self.assertNotContains(resp, "\x00")
+
+    def test_datum_independent_action(self):
+        class IndependentAction(MyAction):
+            datum_independent = True
+            calls = []
+
+            def allowed(self, request, obj=None):
+                self.calls.append(obj)
+                return True
+
+        class TempTable(MyTable):
+            class Meta:
+                name = "my_table"
+                row_actions = (IndependentAction,)
+
+        self.table = TempTable(self.request, TEST_DATA)
+        self.table.render()
+        self.assertEqual(IndependentAction.calls, [TEST_DATA[0]])
+        # Table level checks are unaffected
+        self.table.get_row_actions(TEST_DATA[1])
+        self.table._filter_action(self.table.base_actions['delete'],
+                                  self.request)
+        self.assertEqual(IndependentAction.calls, [TEST_DATA[0], None])
+
     def test_table_actions(self):
         # Single object action
         action_string = "my_table__delete__1"
@@ -604,6 +712,156 @@ class DataTableTests(test.TestCase):
         self.assertEqual(unicode(row_actions[0].verbose_name), "Delete Me")
         self.assertEqual(unicode(row_actions[1].verbose_name), "Log In")
 
+    def test_concurrent_batch_action(self):
+        class ConcurrentBatchAction(MyBatchAction):
+            concurrency = 2
+            threads = set()
+
+            def action(self, request, object_id):
+                self.threads.add(threading.current_thread().ident)
+                if object_id == '2':
+                    raise exceptions.AlreadyExists(object_id, "item")
+
+        class TempTable(MyTable):
+            class Meta:
+                name = "my_table"
+                table_actions = (ConcurrentBatchAction,)
+
+        action_string = "my_table__batch"
+        req = self.factory.post('/my_url/', {'action': action_string,
+                                             'object_ids': [3, 2, 1]})
+        self.table = TempTable(req, TEST_DATA)
+        handled = self.table.maybe_handle()
+        self.assertEqual(handled.status_code, 302)
+        action = self.table.base_actions['batch']
+        self.assertEqual(action.success_ids, ['3', '1'])
+        self.assertNotIn(threading.current_thread().ident, action.threads)
+        messages = [unicode(message.message) for message in req._messages]
+        self.assertEqual(messages,
+                         [u"Unable to batch item: object_2",
+                          u"Batched Items: object_3, object_1"])
+
+    def test_table_rows_update(self):
+        params = {"table": "my_table", "action": "rows_update",
+                  "obj_id": ["1", "2"]}
+        req = self.factory.get('/my_url/',
+                               params,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.table = MyTable(req)
+        resp = self.table.maybe_preempt()
+        self.assertEqual(resp.status_code, 200)
+        content = json.loads(resp.content)
+        self.assertEqual(sorted(content['rows'].keys()), ["1", "2"])
+        self.assertIn("status_down", content['rows']["1"])
+        self.assertEqual(content['errors'], {})
+
+        # Rows are rendered with the batch update attributes
+        row = MyTable(self.request, TEST_DATA).get_rows()[0]
+        self.assertEqual(row.attrs['data-object-id'], '1')
+        self.assertIn("action=rows_update",
+                      row.attrs['data-update-batch-url'])
+
+        # Ids missing from get_data_many are reported as not found
+        class ManyRow(MyRow):
+            def get_data_many(self, request, obj_ids):
+                return dict([(obj.id, obj) for obj in TEST_DATA
+                             if obj.id in obj_ids and obj.status == 'up'])
+
+        class TempTable(MyTable):
+            class Meta:
+                name = "my_table"
+                status_columns = ["status"]
+                row_class = ManyRow
+
+        self.table = TempTable(req)
+        resp = self.table.maybe_preempt()
+        content = json.loads(resp.content)
+        self.assertEqual(content['rows'].keys(), ["1"])
+        self.assertIn("status_up", content['rows']["1"])
+        self.assertEqual(content['errors'], {"2": 404})
+
+    def test_table_row_update_etag(self):
+        params = {"table": "my_table", "action": "row_update", "obj_id": "1"}
+        req = self.factory.get('/my_url/',
+                               params,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        resp = MyTable(req).maybe_preempt()
+        self.assertEqual(resp.status_code, 200)
+        etag = resp['ETag']
+        self.assertContains(resp, 'data-update-etag=%s' % etag)
+
+        # The client already has the current row
+        req = self.factory.get('/my_url/',
+                               params,
+                               HTTP_IF_NONE_MATCH=etag,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        resp = MyTable(req).maybe_preempt()
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.content, "")
+
+        # A stale etag gets the full row
+        req = self.factory.get('/my_url/',
+                               params,
+                               HTTP_IF_NONE_MATCH='"stale"',
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        resp = MyTable(req).maybe_preempt()
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "my_table__row__1")
+
+        # Batched updates leave out the rows which haven't changed
+        params = {"table": "my_table", "action": "rows_update",
+                  "obj_id": ["1", "2"], "etag": [etag.strip('"'), "stale"]}
+        req = self.factory.get('/my_url/',
+                               params,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        resp = MyTable(req).maybe_preempt()
+        content = json.loads(resp.content)
+        self.assertEqual(content['rows'].keys(), ["2"])
+        self.assertEqual(content['unchanged'], ["1"])
+
+        params['obj_id'] = ["1"]
+        req = self.factory.get('/my_url/',
+                               params,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        resp = MyTable(req).maybe_preempt()
+        self.assertEqual(resp.status_code, 304)
+
+    def test_table_api_filter(self):
+        class ApiFilterAction(MyFilterAction):
+            def api_filter(self, table, filter_string):
+                return {'name': filter_string}
+
+        class TempTable(MyTable):
+            class Meta:
+                name = "my_table"
+                table_actions = (ApiFilterAction,)
+
+        action_string = "my_table__filter__q"
+        req = self.factory.post('/my_url/', {action_string: 'object_2'})
+        self.table = TempTable(req)
+        self.assertEqual(self.table.get_api_filter(), {'name': 'object_2'})
+        # The data loaded is already filtered, so it's left as is
+        self.table.data = TEST_DATA
+        self.assertQuerysetEqual(self.table.filtered_data,
+                                 ['<FakeObject: object_1>',
+                                  '<FakeObject: object_2>',
+                                  '<FakeObject: object_3>'])
+
+        # Nothing is pushed down without a filter string or the right method
+        req = self.factory.get('/my_url/', {action_string: 'object_2'})
+        self.table = TempTable(req)
+        self.assertEqual(self.table.get_api_filter(), None)
+        req = self.factory.post('/my_url/', {action_string: ''})
+        self.table = TempTable(req)
+        self.assertEqual(self.table.get_api_filter(), None)
+
+        # Filtering falls back to Python when the filter isn't pushed down
+        req = self.factory.post('/my_url/', {action_string: 'object_2'})
+        self.table = MyTable(req, TEST_DATA)
+        self.assertEqual(self.table.get_api_filter(), None)
+        self.assertQuerysetEqual(self.table.filtered_data,
+                                 ['<FakeObject: object_2>'])
+
     def test_column_uniqueness(self):
         table1 = MyTable(self.request)
         table2 = MyTable(self.request)
@@ -642,6 +900,27 @@ class DataTableTests(test.TestCase):
         self.assertNotContains(res, '<td>3.0</td>')
         self.assertNotContains(res, '<td>6</td>')
 
+    def test_summation_reuses_raw_data(self):
+        table = MyTable(self.request, TEST_DATA_4)
+        table.render()
+        column = table.columns['value']
+        calls = []
+
+        def get_raw_data(datum):
+            calls.append(datum)
+            return datum.value
+
+        column.get_raw_data = get_raw_data
+        self.assertEqual(table.get_summations(), {'value': 3.0})
+        self.assertEqual(column.get_summation(), 3.0)
+        self.assertEqual(calls, [])
+
+        # Without cached values the data is read once per summation column
+        table.data = TEST_DATA_4[:1]
+        table._populate_data_cache()
+        self.assertEqual(column.get_summation(), 2.0)
+        self.assertEqual(calls, [TEST_DATA_4[0]])
+
     def test_table_action_attributes(self):
         table = MyTable(self.request, TEST_DATA)
         self.assertTrue(table.has_actions)
@@ -661,6 +940,106 @@ class DataTableTests(test.TestCase):
         res = http.HttpResponse(table.render())
         self.assertNotContains(res, "<form")
 
+    def test_get_object_by_id(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        self.assertEqual(self.table.get_object_by_id('2'), TEST_DATA[1])
+        # Lookups are coerced to unicode before comparison
+        self.assertEqual(self.table.get_object_by_id(3), TEST_DATA[2])
+        self.assertRaises(exceptions.Http302,
+                          self.table.get_object_by_id, '4')
+
+        # The index is rebuilt when the data is reassigned
+        self.table.data = TEST_DATA_4
+        self.assertEqual(self.table.get_object_by_id('2'), TEST_DATA_4[1])
+        self.assertRaises(exceptions.Http302,
+                          self.table.get_object_by_id, '3')
+
+        # Duplicate ids are still detected
+        self.table.data = TEST_DATA + TEST_DATA_2
+        self.assertRaises(ValueError, self.table.get_object_by_id, '1')
+        self.assertEqual(self.table.get_object_by_id('2'), TEST_DATA[1])
+
+    def test_table_current_item_selection(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        self.table.current_item_id = 2
+        rows = self.table.get_rows()
+        self.assertIn('current_selected', rows[1].classes)
+        self.assertNotIn('current_selected', rows[0].classes)
+        self.assertNotIn('current_selected', rows[2].classes)
+
+    def test_table_sorting(self):
+        req = self.factory.get('/my_url/', {'sort': '-value'})
+        self.table = MyTable(req, TEST_DATA)
+        self.assertQuerysetEqual(self.table.page_data,
+                                 ['<FakeObject: object_3>',
+                                  '<FakeObject: object_1>',
+                                  '<FakeObject: object_2>'])
+        rows = self.table.get_rows()
+        self.assertEqual(rows[0].id, 'my_table__row__3')
+
+        # Unknown and unsortable columns leave the data untouched
+        for sort in ('missing', 'id', 'actions'):
+            req = self.factory.get('/my_url/', {'sort': sort})
+            self.table = MyTable(req, TEST_DATA)
+            self.assertEqual(self.table.get_sort_order(), (None, False))
+            self.assertEqual(self.table.page_data, TEST_DATA)
+
+    def test_table_page_window(self):
+        class TempTable(MyTable):
+            class Meta:
+                name = "my_table"
+                columns = ('id', 'name', 'value')
+                page_size = 2
+
+        self.table = TempTable(self.request, TEST_DATA)
+        rows = self.table.get_rows()
+        self.assertQuerysetEqual(rows, ['<Row: my_table__row__1>',
+                                        '<Row: my_table__row__2>'])
+        self.assertTrue(self.table.has_more_data())
+        self.assertEqual(self.table.get_pagination_string(), "marker=2")
+        self.assertIn("sort=name",
+                      self.table.columns['name'].sort_querystring)
+        self.assertEqual(self.table.columns['id'].sort_querystring, None)
+
+        req = self.factory.get('/my_url/', {'marker': '2', 'sort': 'name'})
+        self.table = TempTable(req, TEST_DATA)
+        rows = self.table.get_rows()
+        self.assertQuerysetEqual(rows, ['<Row: my_table__row__3>'])
+        self.assertFalse(self.table.has_more_data())
+        self.assertIn("sort=-name",
+                      self.table.columns['name'].sort_querystring)
+
+        # A marker which isn't in the data starts from the first page
+        req = self.factory.get('/my_url/', {'marker': '9'})
+        self.table = TempTable(req, TEST_DATA)
+        self.assertEqual(len(self.table.get_rows()), 2)
+
+        req = self.factory.get('/my_url/', {'sort': '-value'})
+        self.table = TempTable(req, TEST_DATA)
+        self.assertEqual(self.table.get_pagination_string(),
+                         "marker=1&sort=-value")
+
+    def test_table_render_stream(self):
+        table = MyTable(self.request, TEST_DATA)
+        chunks = list(table.render_stream(chunk_size=2))
+        # Header, a chunk of two rows, a chunk of one row, footer
+        self.assertEqual(len(chunks), 4)
+        self.assertIn('<table id="my_table"', chunks[0])
+        self.assertNotIn('my_table__row__', chunks[0])
+        self.assertIn('id="my_table__row__1"', chunks[1])
+        self.assertIn('id="my_table__row__2"', chunks[1])
+        self.assertIn('id="my_table__row__3"', chunks[2])
+        resp = http.HttpResponse(u"".join(chunks))
+        self.assertContains(resp, 'class="table_count"', 1)
+        self.assertContains(resp, 'Displaying 3 items', 1)
+        self.assertContains(resp, "data-update-interval", 3)
+
+        # Tables without rows are rendered in one piece
+        table = MyTable(self.request, ())
+        chunks = list(table.render_stream())
+        self.assertEqual(len(chunks), 1)
+        self.assertIn("No items to display.", chunks[0])
+
     def test_table_action_object_display_is_none(self):
         action_string = "my_table__toggle__1"
         req = self.factory.post('/my_url/', {'action': action_string})
@@ -727,6 +1106,46 @@ class DataTableViewTests(test.TestCase):
         self.assertEqual(context['table'].__class__,
                          SingleTableView.table_class)
 
+    def test_data_table_view_streaming(self):
+        view = self._prepare_view(SingleTableView)
+        view.streaming = True
+        view.stream_chunk_size = 1
+        response = view.get(view.request)
+        chunks = list(response)
+        # Page and table headers, one chunk per row, table and page footers
+        self.assertEqual(len(chunks), 7)
+        resp = http.HttpResponse("".join(chunks))
+        self.assertContains(resp, '<table id="my_table"', 1)
+        self.assertContains(resp, 'id="my_table__row__1"', 1)
+        self.assertContains(resp, 'id="my_table__row__3"', 1)
+        self.assertContains(resp, 'Displaying 3 items', 1)
+
+    def test_data_table_view_json(self):
+        view = self._prepare_view(SingleTableView)
+        view.request = self.factory.get('/my_url/',
+                                        {'format': 'json',
+                                         'columns': 'name,status,actions',
+                                         'sort': '-name'})
+        view.request.user = self.user
+        response = view.get(view.request)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        data = json.loads(response.content)
+        self.assertEqual(data['table'], 'my_table')
+        self.assertEqual(data['columns'], ['name', 'status'])
+        self.assertFalse(data['has_more_data'])
+        self.assertEqual([row['id'] for row in data['rows']], ['3', '2', '1'])
+        self.assertEqual(data['rows'][1]['cells'],
+                         {'name': 'custom object_2', 'status': 'down'})
+
+        # Without a column list every data column is included
+        view = self._prepare_view(SingleTableView)
+        view.request = self.factory.get('/my_url/', {'format': 'json'})
+        view.request.user = self.user
+        data = json.loads(view.get(view.request).content)
+        self.assertEqual(data['columns'],
+                         ['id', 'name', 'value', 'optional', 'status'])
+        self.assertEqual(data['rows'][2]['cells']['optional'], None)
+
     def test_data_table_view_not_authorized(self):
         view = self._prepare_view(SingleTableViewWithPermissions)
         context = view.get_context_data()
@@ -15,12 +15,17 @@
 #    under the License.
 
 
+import gc
 import os
+import weakref
 
 from django.core.exceptions import ValidationError
+from django.test.utils import override_settings
 
 from horizon.test import helpers as test
 from horizon.utils import fields
+from horizon.utils import instrumentation
+from horizon.utils import memoized
 from horizon.utils import secret_key
 
 
@@ -194,3 +199,169 @@ class SecretKeyTests(test.TestCase):
         self.assertRaises(secret_key.FilePermissionError,
                           secret_key.generate_or_read_from_file, key_file)
         os.remove(key_file)
+
+
+class MemoizedTests(test.TestCase):
+    def setUp(self):
+        super(MemoizedTests, self).setUp()
+        self.calls = 0
+
+    def record(self, *args):
+        # Returns a new value on every call without keeping the arguments.
+        self.calls += 1
+        return self.calls
+
+    def test_memoized(self):
+        cached = memoized.memoized(self.record)
+        self.assertEqual(cached(1), 1)
+        self.assertEqual(cached(1), 1)
+        # Unhashable arguments aren't cached
+        self.assertEqual(cached([1]), 2)
+        self.assertEqual(cached([1]), 3)
+        self.assertEqual(cached.stats(), {"hits": 1, "misses": 1, "size": 1})
+
+    def test_request_memoized(self):
+        cached = memoized.request_memoized(self.record)
+        request = self.factory.get('/')
+        self.assertEqual(cached("a", request), 1)
+        self.assertEqual(cached("a", request), 1)
+        self.assertEqual(cached("a", self.factory.get('/')), 2)
+        # Calls without a request aren't cached
+        self.assertEqual(cached("a"), 3)
+        self.assertEqual(cached("a"), 4)
+        gc.collect()
+        self.assertEqual(cached.stats(), {"hits": 1, "misses": 2, "size": 1})
+        # The values go away with the request
+        del request
+        gc.collect()
+        self.assertEqual(cached.stats()["size"], 0)
+
+    def test_request_memoized_value_referencing_request(self):
+        class Holder(object):
+            def __init__(self, request):
+                self.request = request
+
+        cached = memoized.request_memoized(Holder)
+        request = self.factory.get('/')
+        request_ref = weakref.ref(request)
+        self.assertIs(cached(request), cached(request))
+        self.assertEqual(cached.stats()["size"], 1)
+        # The request is collected although the cached value refers to it.
+        del request
+        gc.collect()
+        self.assertIsNone(request_ref())
+        self.assertEqual(cached.stats()["size"], 0)
+
+    def test_weak_memoized(self):
+        class Owner(object):
+            pass
+
+        cached = memoized.weak_memoized(self.record)
+        owner = Owner()
+        self.assertEqual(cached("a", owner), 1)
+        self.assertEqual(cached("a", owner), 1)
+        self.assertEqual(cached("b", owner), 2)
+        self.assertEqual(cached.stats()["size"], 2)
+        del owner
+        gc.collect()
+        self.assertEqual(cached.stats()["size"], 0)
+
+    def test_bounded_memoized(self):
+        cached = memoized.bounded_memoized(max_size=2)(self.record)
+        cached(1)
+        cached(2)
+        cached(1)
+        # The least recently used value is dropped first
+        cached(3)
+        self.assertEqual(cached.stats(), {"hits": 1, "misses": 3, "size": 2})
+        self.assertEqual(cached(1), 1)
+        self.assertEqual(cached(2), 4)
+
+        cached = memoized.bounded_memoized(self.record, ttl=-1)
+        self.assertEqual(cached(1), 5)
+        # The value has expired already
+        self.assertEqual(cached(1), 6)
+
+    def test_get_stats(self):
+        def cached_function():
+            return 42
+        cached = memoized.memoized(cached_function)
+        cached()
+        name = "%s.cached_function" % __name__
+        self.assertEqual(memoized.get_stats()[name],
+                         {"hits": 0, "misses": 1, "size": 1})
+
+
+class InstrumentationTests(test.TestCase):
+    @override_settings(DEBUG=True)
+    def test_instrumented_client(self):
+        class Servers(object):
+            def list(self):
+                return ["server_1", "server_2"]
+
+        class Client(object):
+            def __init__(self):
+                self.servers = Servers()
+                self.token = None
+
+        @instrumentation.instrumented_client("compute")
+        def client(request):
+            return Client()
+
+        request = self.factory.get('/')
+        c = client(request)
+        c.token = "secret"
+        self.assertEqual(c.token, "secret")
+        self.assertEqual(c.servers.list(), ["server_1", "server_2"])
+        self.assertEqual(c.servers.list(), ["server_1", "server_2"])
+
+        calls = instrumentation.get_calls(request)
+        self.assertEqual([(call.service, call.method, call.size)
+                          for call in calls],
+                         [("compute", "servers.list", 2)] * 2)
+        self.assertEqual(instrumentation.repeated_calls(calls, threshold=2),
+                         [("compute", "servers.list", 2)])
+
+    @override_settings(DEBUG=True)
+    def test_instrumented_client_lazy_result(self):
+        class Images(object):
+            def list(self):
+                for image in ("image_1", "image_2", "image_3"):
+                    yield image
+
+        class Client(object):
+            images = Images()
+
+        @instrumentation.instrumented_client("image")
+        def client(request):
+            return Client()
+
+        request = self.factory.get('/')
+        images = client(request).images.list()
+        # The call is recorded once the result has been iterated.
+        self.assertEqual(instrumentation.get_calls(request), [])
+        self.assertEqual(list(images), ["image_1", "image_2", "image_3"])
+        calls = instrumentation.get_calls(request)
+        self.assertEqual([(call.service, call.method, call.size)
+                          for call in calls],
+                         [("image", "images.list", 3)])
+
+    def test_instrumented_client_without_debug(self):
+        client = object()
+
+        @instrumentation.instrumented_client("compute")
+        def get_client(request):
+            return client
+
+        request = self.factory.get('/')
+        self.assertIs(get_client(request), client)
+        self.assertEqual(instrumentation.get_calls(request), [])
+
+    def test_server_timing(self):
+        calls = [instrumentation.ApiCall("compute", "servers.list", 0.25, 2),
+                 instrumentation.ApiCall("image", "images.list", 0.5, 1),
+                 instrumentation.ApiCall("compute", "flavors.list", 0.25, 5)]
+        self.assertEqual(instrumentation.server_timing(calls, 1.5),
+                         'total;dur=1500.0, '
+                         'compute;dur=500.0;desc="2 calls", '
+                         'image;dur=500.0;desc="1 calls"')
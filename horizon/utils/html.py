@@ -5,6 +5,10 @@ from django.forms.util import flatatt
 
 class HTMLElement(object):
     """ A generic base class that gracefully handles html-style attributes. """
+    # Subclasses which declare their own __slots__ don't get an instance
+    # dictionary.
+    __slots__ = ()
+
     def __init__(self):
         self.attrs = getattr(self, "attrs", {})
         self.classes = getattr(self, "classes", [])
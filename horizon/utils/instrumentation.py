@@ -0,0 +1,248 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Records the calls made through API clients during a request, and keeps a
+summary of recent requests to find slow pages and repeated calls.
+"""
+
+import collections
+import functools
+import threading
+import time
+import types
+
+from django.conf import settings
+
+from horizon import conf
+
+
+ApiCall = collections.namedtuple("ApiCall",
+                                 ["service", "method", "duration", "size"])
+
+# Attribute of the request holding the calls made during it.
+CALLS_ATTR = "_api_calls"
+# How many levels of attributes of a client are instrumented, enough for
+# calls such as ``client.servers.list()``.
+MAX_DEPTH = 3
+# Calls made this many times during a request are reported as repeated.
+REPEATED_CALL_THRESHOLD = 3
+
+_recent_requests = collections.deque()
+_lock = threading.Lock()
+
+
+def _payload_size(result):
+    """
+    Returns the number of items in the result of an API call, or of bytes
+    for strings. Returns ``None`` if the size isn't known.
+    """
+    if isinstance(result, (list, tuple, dict, basestring)):
+        return len(result)
+    return None
+
+
+class ClientProxy(object):
+    """
+    Stands in for an API client, or one of its attributes, and records the
+    calls made through it in ``calls``, the list of calls of a request.
+    The request itself isn't referenced, so that results which keep the
+    client don't keep the request alive.
+    """
+    def __init__(self, target, calls, service, path=(), depth=1):
+        self.__dict__.update({"_target": target,
+                              "_calls": calls,
+                              "_service": service,
+                              "_path": path,
+                              "_depth": depth})
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if self._depth >= MAX_DEPTH:
+            return attr
+        if callable(attr) or hasattr(attr, "__dict__"):
+            return ClientProxy(attr, self._calls, self._service,
+                               self._path + (name,), self._depth + 1)
+        return attr
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def __call__(self, *args, **kwargs):
+        start = time.time()
+        try:
+            result = self._target(*args, **kwargs)
+        except Exception:
+            self._record(time.time() - start, None)
+            raise
+        if isinstance(result, types.GeneratorType):
+            return self._iterate(result, start)
+        self._record(time.time() - start, _payload_size(result))
+        return result
+
+    def _iterate(self, result, start):
+        """
+        Yields the items of a lazily evaluated result, such as the images
+        listed by glance, which makes its requests while it is iterated.
+        The call is recorded once the iteration is over, with the number of
+        items as its size. Its duration includes the time the caller spends
+        between items, and a result which is never fully iterated is only
+        recorded when it is garbage collected.
+        """
+        count = 0
+        try:
+            for item in result:
+                count += 1
+                yield item
+        finally:
+            self._record(time.time() - start, count)
+
+    def _record(self, duration, size):
+        self._calls.append(ApiCall(self._service, ".".join(self._path),
+                                   duration, size))
+
+    def __repr__(self):
+        return repr(self._target)
+
+
+def unwrap(obj):
+    """ Returns the client, or client attribute, a proxy stands in for. """
+    if isinstance(obj, ClientProxy):
+        return obj._target
+    return obj
+
+
+def instrumented_client(service):
+    """
+    Decorator for functions which take a request as their first argument
+    and return an API client for ``service``. The calls made through the
+    client are recorded on the request.
+
+    Like :class:`~horizon.middleware.ApiTimingMiddleware`, which reports
+    them, this only happens when ``DEBUG`` is ``True``; the client is
+    returned as is otherwise.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(request, *args, **kwargs):
+            client = func(request, *args, **kwargs)
+            if client is None or not settings.DEBUG:
+                return client
+            calls = request.__dict__.setdefault(CALLS_ATTR, [])
+            return ClientProxy(client, calls, service)
+        return wrapper
+    return decorator
+
+
+def record_call(request, service, method, duration, size=None):
+    """ Records an API call made during ``request``. """
+    calls = request.__dict__.setdefault(CALLS_ATTR, [])
+    calls.append(ApiCall(service, method, duration, size))
+
+
+def get_calls(request):
+    """ Returns the API calls recorded during ``request``. """
+    return getattr(request, CALLS_ATTR, [])
+
+
+def repeated_calls(calls, threshold=REPEATED_CALL_THRESHOLD):
+    """
+    Returns a list of ``(service, method, count)`` tuples for the methods
+    called at least ``threshold`` times, most frequent first. These usually
+    point to a lookup made once per object where a single listing would do.
+    """
+    counts = collections.defaultdict(int)
+    for call in calls:
+        counts[(call.service, call.method)] += 1
+    repeated = [(service, method, count)
+                for (service, method), count in counts.items()
+                if count >= threshold]
+    return sorted(repeated, key=lambda item: item[2], reverse=True)
+
+
+def server_timing(calls, duration):
+    """
+    Returns the value of a ``Server-Timing`` header with the total duration
+    of the request and the time spent calling each service, in milliseconds.
+    """
+    durations = collections.defaultdict(float)
+    counts = collections.defaultdict(int)
+    for call in calls:
+        durations[call.service] += call.duration
+        counts[call.service] += 1
+    metrics = ["total;dur=%.1f" % (duration * 1000)]
+    for service in sorted(durations):
+        metrics.append('%s;dur=%.1f;desc="%d calls"'
+                       % (service, durations[service] * 1000,
+                          counts[service]))
+    return ", ".join(metrics)
+
+
+def summarize(request, duration):
+    """ Returns a summary of the API calls made during ``request``. """
+    calls = get_calls(request)
+    return {"path": request.path,
+            "method": request.method,
+            "duration": duration,
+            "api_calls": len(calls),
+            "api_duration": sum([call.duration for call in calls]),
+            "calls": [call._asdict() for call in calls],
+            "repeated_calls": repeated_calls(calls)}
+
+
+def add_recent_request(summary):
+    """
+    Keeps the summary of a request among the recent ones, up to
+    ``HORIZON_CONFIG['api_timing_history']`` of them.
+    """
+    limit = conf.HORIZON_CONFIG['api_timing_history']
+    with _lock:
+        _recent_requests.append(summary)
+        while len(_recent_requests) > limit:
+            _recent_requests.popleft()
+
+
+def get_recent_requests():
+    with _lock:
+        return list(_recent_requests)
+
+
+def slowest_requests(limit=10):
+    """ Returns the summaries of the slowest recent requests. """
+    summaries = sorted(get_recent_requests(),
+                       key=lambda summary: summary["duration"],
+                       reverse=True)
+    return summaries[:limit]
+
+
+def repeated_call_patterns():
+    """
+    Returns the calls repeated within recent requests, grouped by page,
+    as a list of dicts with the number of requests showing the pattern and
+    the most calls made by one of them.
+    """
+    patterns = {}
+    for summary in get_recent_requests():
+        for service, method, count in summary["repeated_calls"]:
+            key = (summary["path"], service, method)
+            pattern = patterns.setdefault(key, {"path": summary["path"],
+                                                "service": service,
+                                                "method": method,
+                                                "requests": 0,
+                                                "max_calls": 0})
+            pattern["requests"] += 1
+            pattern["max_calls"] = max(pattern["max_calls"], count)
+    return sorted(patterns.values(),
+                  key=lambda pattern: pattern["max_calls"],
+                  reverse=True)
@@ -14,29 +14,81 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import functools
+import threading
+import time
+import weakref
+
+from django.http import HttpRequest
+
+
+# All of the memoized functions, to report their statistics.
+_registry = weakref.WeakValueDictionary()
+
+
+def get_stats():
+    """
+    Returns a dict mapping the name of every memoized function to its
+    hit, miss and size statistics.
+    """
+    return dict([(name, cache.stats())
+                 for name, cache in _registry.items()])
 
 
 class memoized(object):
     '''Decorator. Caches a function's return value each time it is called.
     If called later with the same arguments, the cached value is returned
     (not reevaluated).
+
+    The cache is never emptied, so this is only suitable for functions
+    called with a bounded set of arguments. See :class:`request_memoized`,
+    :class:`weak_memoized` and :class:`bounded_memoized` otherwise.
     '''
     def __init__(self, func):
         self.func = func
         self.cache = {}
+        self.hits = 0
+        self.misses = 0
+        name = "%s.%s" % (func.__module__, func.__name__)
+        _registry[name] = self
 
     def __call__(self, *args):
         try:
-            return self.cache[args]
-        except KeyError:
-            value = self.func(*args)
-            self.cache[args] = value
-            return value
+            value = self.cache_get(args)
         except TypeError:
             # uncachable -- for instance, passing a list as an argument.
             # Better to not cache than to blow up entirely.
             return self.func(*args)
+        except KeyError:
+            self.misses += 1
+            value = self.func(*args)
+            try:
+                self.cache_set(args, value)
+            except TypeError:
+                pass
+            return value
+        self.hits += 1
+        return value
+
+    def cache_get(self, args):
+        """
+        Returns the cached value for ``args``. Raises ``KeyError`` if there
+        is none and ``TypeError`` if ``args`` can't be cached.
+        """
+        return self.cache[args]
+
+    def cache_set(self, args, value):
+        self.cache[args] = value
+
+    def cache_size(self):
+        return len(self.cache)
+
+    def stats(self):
+        """ Returns the hits, misses and current size of the cache. """
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "size": self.cache_size()}
 
     def __repr__(self):
         '''Return the function's docstring.'''
@@ -48,3 +100,118 @@ class memoized(object):
 
     def __str__(self):
         return str(self.func)
+
+
+class weak_memoized(memoized):
+    '''Decorator. Like :class:`memoized`, but the values are cached per
+    object of the first argument which supports weak references, and are
+    dropped together with that object.
+
+    Values which refer back to that object keep it, and themselves, alive.
+    '''
+    def __init__(self, func):
+        super(weak_memoized, self).__init__(func)
+        self.cache = weakref.WeakKeyDictionary()
+
+    def split_args(self, args):
+        """
+        Returns the object to cache the values on for ``args`` and the key
+        for the remaining arguments.
+        """
+        for index, arg in enumerate(args):
+            try:
+                weakref.ref(arg)
+            except TypeError:
+                continue
+            return arg, args[:index] + args[index + 1:]
+        raise TypeError("None of the arguments supports weak references.")
+
+    def cache_get(self, args):
+        owner, key = self.split_args(args)
+        return self.cache[owner][key]
+
+    def cache_set(self, args, value):
+        owner, key = self.split_args(args)
+        self.cache.setdefault(owner, {})[key] = value
+
+    def cache_size(self):
+        return sum([len(values) for values in self.cache.values()])
+
+
+class request_memoized(weak_memoized):
+    '''Decorator. Caches values for the duration of the request passed
+    as one of the arguments, so they are freed together with the request
+    once its response is done. Calls without a request aren't cached.
+
+    The values are stored on the request itself, so they are freed with it
+    even when they refer back to it.
+    '''
+    # Attribute of the request holding the values of memoized functions.
+    CACHE_ATTR = "_memoized"
+
+    def __init__(self, func):
+        super(request_memoized, self).__init__(func)
+        # The requests holding values, only to report the cache size.
+        self.cache = weakref.WeakSet()
+
+    def split_args(self, args):
+        for index, arg in enumerate(args):
+            if isinstance(arg, HttpRequest):
+                return arg, args[:index] + args[index + 1:]
+        raise TypeError("None of the arguments is a request.")
+
+    def _values(self, request):
+        return request.__dict__.setdefault(self.CACHE_ATTR, {}) \
+                               .setdefault(self, {})
+
+    def cache_get(self, args):
+        request, key = self.split_args(args)
+        return self._values(request)[key]
+
+    def cache_set(self, args, value):
+        request, key = self.split_args(args)
+        self._values(request)[key] = value
+        self.cache.add(request)
+
+    def cache_size(self):
+        return sum([len(request.__dict__[self.CACHE_ATTR][self])
+                    for request in list(self.cache)])
+
+
+class bounded_memoized(memoized):
+    '''Decorator. Like :class:`memoized`, but keeps at most ``max_size``
+    values, dropping the least recently used ones first, and optionally
+    expires values ``ttl`` seconds after they were cached. Usage::
+
+        @bounded_memoized(max_size=100, ttl=60)
+        def get_thing(thing_id):
+            ...
+    '''
+    def __new__(cls, func=None, max_size=128, ttl=None):
+        if func is None:
+            return lambda func: cls(func, max_size=max_size, ttl=ttl)
+        return super(bounded_memoized, cls).__new__(cls)
+
+    def __init__(self, func, max_size=128, ttl=None):
+        super(bounded_memoized, self).__init__(func)
+        self.cache = collections.OrderedDict()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+
+    def cache_get(self, args):
+        with self.lock:
+            expires, value = self.cache.pop(args)
+            if expires is not None and expires < time.time():
+                raise KeyError(args)
+            # Move the value to the most recently used end.
+            self.cache[args] = (expires, value)
+            return value
+
+    def cache_set(self, args, value):
+        expires = time.time() + self.ttl if self.ttl is not None else None
+        with self.lock:
+            self.cache.pop(args, None)
+            self.cache[args] = (expires, value)
+            while len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
@@ -14,11 +14,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+
+from django import http
 from django import shortcuts
 from django.views import generic
 
 import horizon
 from horizon import exceptions
+from horizon.utils import instrumentation
 
 
 def user_home(request):
@@ -26,6 +30,22 @@ def user_home(request):
     return shortcuts.redirect(horizon.get_user_home(request.user))
 
 
+def api_timing(request):
+    """
+    Returns the slowest recent pages and the API calls repeated within a
+    page as JSON, from the requests recorded by
+    :class:`~horizon.middleware.ApiTimingMiddleware`. Only for debugging.
+    """
+    try:
+        limit = int(request.GET.get("limit", 10))
+    except ValueError:
+        limit = 10
+    data = {"slowest": instrumentation.slowest_requests(limit),
+            "repeated_calls": instrumentation.repeated_call_patterns()}
+    return http.HttpResponse(json.dumps(data, indent=2),
+                             content_type="application/json")
+
+
 class APIView(generic.TemplateView):
     """ A quick class-based view for putting API data into a template.
 
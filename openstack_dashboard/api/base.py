@@ -18,12 +18,22 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from collections import OrderedDict
 from collections import Sequence
+import datetime
+import functools
+import hashlib
 import logging
+from multiprocessing.pool import ThreadPool
+import threading
+import uuid
 
 from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
 
 from horizon import exceptions
+from horizon.utils import instrumentation
 
 
 __all__ = ('APIResourceWrapper', 'APIDictWrapper',
@@ -66,28 +76,77 @@ class APIVersionManager(object):
         return self.supported[self._active]
 
 
+class APIAttribute(object):
+    """
+    Reads one of the ``_attrs`` of an :class:`APIResourceWrapper` from the
+    wrapped resource, without the lookup going through ``__getattr__``.
+    """
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, wrapper, owner=None):
+        if wrapper is None:
+            return self
+        # __getattr__ won't find properties
+        return wrapper._apiresource.__getattribute__(self.name)
+
+
+class APIDictAttribute(APIAttribute):
+    """ Reads one of the ``_attrs`` of an :class:`APIDictWrapper`. """
+    __slots__ = ()
+
+    def __get__(self, wrapper, owner=None):
+        if wrapper is None:
+            return self
+        try:
+            return wrapper._apidict[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
+
+
+class APIWrapperType(type):
+    """
+    Metaclass of the API wrappers. It keeps the ``_attrs`` of each wrapper
+    class in a frozenset and adds an attribute for each of them which isn't
+    defined by the class, so they are resolved directly.
+    """
+    def __new__(mcs, name, bases, attrs):
+        cls = super(APIWrapperType, mcs).__new__(mcs, name, bases, attrs)
+        cls._attr_set = frozenset(cls._attrs)
+        for attr in cls._attr_set:
+            if not hasattr(cls, attr):
+                setattr(cls, attr, cls._attr_class(attr))
+        return cls
+
+
 class APIResourceWrapper(object):
     """ Simple wrapper for api objects
 
         Define _attrs on the child class and pass in the
         api object as the only argument to the constructor
     """
+    __metaclass__ = APIWrapperType
+    __slots__ = ('_apiresource',)
     _attrs = []
+    _attr_class = APIAttribute
 
     def __init__(self, apiresource):
         self._apiresource = apiresource
 
     def __getattr__(self, attr):
-        if attr in self._attrs:
-            # __getattr__ won't find properties
+        # Only reached for attributes which aren't in _attrs, or which are
+        # defined by the class but failed, such as properties.
+        if attr in self._attr_set:
             return self._apiresource.__getattribute__(attr)
-        else:
+        if attr != '_apiresource' and LOG.isEnabledFor(logging.DEBUG):
             msg = ('Attempted to access unknown attribute "%s" on '
                    'APIResource object of type "%s" wrapping resource of '
                    'type "%s".') % (attr, self.__class__,
                                     self._apiresource.__class__)
             LOG.debug(exceptions.error_color(msg))
-            raise AttributeError(attr)
+        raise AttributeError(attr)
 
     def __repr__(self):
         return "<%s: %s>" % (self.__class__.__name__,
@@ -104,32 +163,37 @@ class APIDictWrapper(object):
         dictionary, in addition to attribute accesses.
 
         Attribute access is the preferred method of access, to be
-        consistent with api resource objects from novaclient.
+        consistent with api resource objects from novaclient. The keys
+        listed in ``_attrs``, if any, are resolved without going through
+        ``__getattr__``.
     """
+    __metaclass__ = APIWrapperType
+    __slots__ = ('_apidict',)
+    _attrs = []
+    _attr_class = APIDictAttribute
+
     def __init__(self, apidict):
         self._apidict = apidict
 
     def __getattr__(self, attr):
+        if attr == '_apidict':
+            raise AttributeError(attr)
         try:
             return self._apidict[attr]
         except KeyError:
-            msg = 'Unknown attribute "%(attr)s" on APIResource object ' \
-                  'of type "%(cls)s"' % {'attr': attr, 'cls': self.__class__}
-            LOG.debug(exceptions.error_color(msg))
-            raise AttributeError(msg)
+            if LOG.isEnabledFor(logging.DEBUG):
+                msg = 'Unknown attribute "%(attr)s" on APIResource object ' \
+                      'of type "%(cls)s"' % {'attr': attr,
+                                             'cls': self.__class__}
+                LOG.debug(exceptions.error_color(msg))
+            raise AttributeError(attr)
 
     def __getitem__(self, item):
-        try:
-            return self.__getattr__(item)
-        except AttributeError as e:
-            # caller is expecting a KeyError
-            raise KeyError(e)
+        # caller is expecting a KeyError
+        return self._apidict[item]
 
     def get(self, item, default=None):
-        try:
-            return self.__getattr__(item)
-        except AttributeError:
-            return default
+        return self._apidict.get(item, default)
 
     def __repr__(self):
         return "<%s: %s>" % (self.__class__.__name__, self._apidict)
@@ -226,38 +290,293 @@ def get_url_for_service(service, region, endpoint_type):
     return None
 
 
+class ServiceCatalogIndex(object):
+    """
+    Maps the services of a service catalog and their endpoints, in every
+    region, so that finding them is a dictionary lookup. The first service
+    of each type wins, as it does with :func:`get_service_from_catalog`, and
+    its URLs are found the same way as by :func:`get_url_for_service`.
+    """
+    def __init__(self, catalog):
+        # (service_type, region, endpoint_type) -> url
+        self.urls = {}
+        # service_type -> (service name, regions it has endpoints in)
+        self.services = {}
+        for service in catalog or []:
+            if service['type'] not in self.services:
+                self.add_service(service)
+
+    def add_service(self, service):
+        service_type = service['type']
+        identity_version = get_version_from_service(service)
+        regions = set()
+        for endpoint in service['endpoints']:
+            # The region is ignored for identity.
+            if service_type == 'identity':
+                region = None
+            else:
+                region = endpoint.get('region')
+            if identity_version < 3:
+                # Only the first endpoint of a region is used.
+                if region not in regions:
+                    for endpoint_type, url in endpoint.items():
+                        self.urls[(service_type, region, endpoint_type)] = url
+            else:
+                for endpoint_type, interface in \
+                        ENDPOINT_TYPE_TO_INTERFACE.items():
+                    if endpoint.get('interface') == interface:
+                        self.urls.setdefault(
+                            (service_type, region, endpoint_type),
+                            endpoint.get('url'))
+            regions.add(region)
+        self.services[service_type] = (service.get('name'), regions)
+
+    def url_for(self, service_type, region, endpoint_type):
+        if service_type == 'identity':
+            region = None
+        return self.urls.get((service_type, region, endpoint_type))
+
+    def is_service_enabled(self, service_type, region, service_name=None):
+        if service_type not in self.services:
+            return False
+        name, regions = self.services[service_type]
+        if service_type == 'identity':
+            region = None
+        if region not in regions:
+            return False
+        if service_name:
+            return name == service_name
+        return True
+
+
+# Attribute of the user holding the index of their service catalog.
+CATALOG_INDEX_ATTR = "_service_catalog_index"
+
+
+def get_catalog_index(user):
+    """
+    Returns the :class:`ServiceCatalogIndex` of the service catalog of
+    ``user``, building it the first time it's needed.
+    """
+    catalog = user.service_catalog
+    cached = getattr(user, CATALOG_INDEX_ATTR, None)
+    # A new catalog, e.g. after switching projects, needs a new index.
+    if cached is None or cached[0] is not catalog:
+        cached = (catalog, ServiceCatalogIndex(catalog))
+        setattr(user, CATALOG_INDEX_ATTR, cached)
+    return cached[1]
+
+
 def url_for(request, service_type, endpoint_type=None):
     endpoint_type = endpoint_type or getattr(settings,
                                              'OPENSTACK_ENDPOINT_TYPE',
                                              'publicURL')
     fallback_endpoint_type = getattr(settings, 'SECONDARY_ENDPOINT_TYPE', None)
 
-    catalog = request.user.service_catalog
-    service = get_service_from_catalog(catalog, service_type)
-    if service:
-        url = get_url_for_service(service,
-                                  request.user.services_region,
-                                  endpoint_type)
-        if not url and fallback_endpoint_type:
-            url = get_url_for_service(service,
-                                      request.user.services_region,
-                                      fallback_endpoint_type)
-        if url:
-            return url
+    index = get_catalog_index(request.user)
+    region = request.user.services_region
+    url = index.url_for(service_type, region, endpoint_type)
+    if not url and fallback_endpoint_type:
+        url = index.url_for(service_type, region, fallback_endpoint_type)
+    if url:
+        return url
     raise exceptions.ServiceCatalogException(service_type)
 
 
 def is_service_enabled(request, service_type, service_name=None):
-    service = get_service_from_catalog(request.user.service_catalog,
-                                       service_type)
-    if service:
-        region = request.user.services_region
-        for endpoint in service['endpoints']:
-            # ignore region for identity
-            if service['type'] == 'identity' or \
-               endpoint['region'] == region:
-                if service_name:
-                    return service['name'] == service_name
-                else:
-                    return True
-    return False
+    index = get_catalog_index(request.user)
+    return index.is_service_enabled(service_type,
+                                    request.user.services_region,
+                                    service_name)
+
+
+def concurrent_map(func, items):
+    """
+    Calls ``func`` on each of ``items`` using a pool of at most
+    ``OPENSTACK_API_CONCURRENCY`` threads, and returns the results in the
+    same order. An exception raised by one of the calls is raised again
+    once they are all done.
+
+    API clients aren't safe to share between threads, so ``func`` should
+    get its clients through the client factories, which keep one per
+    thread.
+    """
+    items = list(items)
+    concurrency = min(getattr(settings, 'OPENSTACK_API_CONCURRENCY', 10),
+                      len(items))
+    if concurrency < 2:
+        return [func(item) for item in items]
+    pool = ThreadPool(concurrency)
+    try:
+        return pool.map(func, items)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _token_expired(expires, now):
+    if expires is None:
+        return False
+    if timezone.is_naive(expires):
+        expires = timezone.make_aware(expires, timezone.utc)
+    return expires <= now
+
+
+class ClientPool(threading.local):
+    """
+    Keeps the API clients built for a service, endpoint and token so that
+    later calls, in the same request or the following ones, reuse them
+    along with their open connections.
+
+    Each thread has its own clients, since they aren't safe to share
+    between threads. At most ``OPENSTACK_CLIENT_POOL_SIZE`` clients are kept
+    per thread, the least recently used being dropped first, and clients
+    are dropped as soon as their token expires.
+    """
+    def __init__(self):
+        self.clients = OrderedDict()
+
+    def get(self, key, expires, build):
+        """
+        Returns the client stored under ``key``, or the one returned by
+        ``build``, which is kept until ``expires``.
+        """
+        now = datetime.datetime.utcnow().replace(tzinfo=timezone.utc)
+        self.evict_expired(now)
+        size = getattr(settings, 'OPENSTACK_CLIENT_POOL_SIZE', 10)
+        if key in self.clients:
+            # Mark the client as the most recently used one.
+            client, expires = self.clients.pop(key)
+        else:
+            client = build()
+            if client is None or _token_expired(expires, now):
+                return client
+        self.clients[key] = (client, expires)
+        while len(self.clients) > size:
+            self.clients.popitem(last=False)
+        return client
+
+    def evict_expired(self, now):
+        for key, (client, expires) in self.clients.items():
+            if _token_expired(expires, now):
+                del self.clients[key]
+
+    def clear(self):
+        self.clients.clear()
+
+
+client_pool = ClientPool()
+
+
+def pooled_client(service_type):
+    """
+    Decorator for functions which take a request and return an API client
+    for ``service_type``, so that the clients are kept in the
+    :class:`ClientPool` for the endpoint of the service and the token of
+    the user.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(request):
+            try:
+                endpoint = url_for(request, service_type)
+            except exceptions.ServiceCatalogException:
+                return func(request)
+            token = request.user.token
+            key = (service_type, endpoint, token.id)
+            return client_pool.get(key, getattr(token, 'expires', None),
+                                   lambda: func(request))
+        return wrapper
+    return decorator
+
+
+# How long, in seconds, the catalogs of each kind of resource are cached.
+# These can be overridden with the OPENSTACK_CATALOG_CACHE_TTL setting.
+CATALOG_CACHE_TTL = {
+    'flavors': 600,
+    'images': 300,
+    'availability_zones': 600,
+    'extensions': 3600,
+    'roles': 3600,
+}
+
+
+def _catalog_ttl(resource):
+    ttls = getattr(settings, 'OPENSTACK_CATALOG_CACHE_TTL', {})
+    return ttls.get(resource, CATALOG_CACHE_TTL.get(resource, 0))
+
+
+def _catalog_cache_key(*bits):
+    digest = hashlib.md5("\x00".join([unicode(bit) for bit in bits])
+                         .encode('utf-8')).hexdigest()
+    return "openstack_dashboard:catalog:%s" % digest
+
+
+def _catalog_generation(endpoint, resource, ttl):
+    """
+    Returns the current generation of the catalogs of ``resource`` for
+    ``endpoint``. Invalidating a catalog starts a new generation, so that
+    the catalogs cached for every project and token are dropped at once.
+    """
+    key = _catalog_cache_key("generation", endpoint, resource)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid.uuid4().hex, ttl)
+        generation = cache.get(key)
+    return generation
+
+
+def cached_catalog(request, resource, service_type, scope, manager, fetch,
+                   variant=None):
+    """
+    Returns the list of resources returned by ``fetch``, a function taking
+    no argument, from the cache if it has already been fetched.
+
+    The catalog is cached for the endpoint of ``service_type`` and, depending
+    on ``scope``, for every user (``"global"``), the project of the user
+    (``"project"``) or only their token (``"token"``). ``variant`` tells apart
+    the catalogs of the same resource fetched with different arguments.
+
+    Only the data of the resources is cached; they are rebuilt with
+    ``manager`` so that they can still be used to make API calls. Like the
+    resources fetched from the API, they refer to the manager itself rather
+    than to the instrumented proxy of it, which is tied to the request.
+    """
+    ttl = _catalog_ttl(resource)
+    if not ttl:
+        return fetch()
+    try:
+        endpoint = url_for(request, service_type)
+    except exceptions.ServiceCatalogException:
+        return fetch()
+    if scope == 'project':
+        owner = request.user.tenant_id
+    elif scope == 'token':
+        owner = request.user.token.id
+    else:
+        owner = None
+    generation = _catalog_generation(endpoint, resource, ttl)
+    key = _catalog_cache_key(endpoint, resource, generation, scope, owner,
+                             variant)
+    cached = cache.get(key)
+    if cached is not None:
+        resource_class, infos = cached
+        manager = instrumentation.unwrap(manager)
+        return [resource_class(manager, info, loaded=True) for info in infos]
+    resources = list(fetch())
+    resource_class = resources[0].__class__ if resources else None
+    cache.set(key, (resource_class, [item._info for item in resources]), ttl)
+    return resources
+
+
+def invalidate_catalog(request, resource, service_type):
+    """
+    Drops the cached catalogs of ``resource`` for the endpoint of
+    ``service_type``, in every scope. Call it once Horizon has changed the
+    resources.
+    """
+    try:
+        endpoint = url_for(request, service_type)
+    except exceptions.ServiceCatalogException:
+        return
+    cache.delete(_catalog_cache_key("generation", endpoint, resource))
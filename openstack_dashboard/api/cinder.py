@@ -30,8 +30,11 @@ from django.utils.translation import ugettext_lazy as _
 from cinderclient.v1 import client as cinder_client
 
 from horizon import exceptions
+from horizon.utils.instrumentation import instrumented_client
 
 from openstack_dashboard.api.base import QuotaSet
+from openstack_dashboard.api.base import concurrent_map
+from openstack_dashboard.api.base import pooled_client
 from openstack_dashboard.api.base import url_for
 from openstack_dashboard.api import nova
 
@@ -42,6 +45,8 @@ LOG = logging.getLogger(__name__)
 VOLUME_STATE_AVAILABLE = "available"
 
 
+@instrumented_client('volume')
+@pooled_client('volume')
 def cinderclient(request):
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cinder_url = ""
@@ -77,9 +82,19 @@ def volume_list(request, search_opts=None):
 def volume_get(request, volume_id):
     volume_data = cinderclient(request).volumes.get(volume_id)
 
+    server_ids = []
+    for attachment in volume_data.attachments:
+        if ("server_id" in attachment
+                and attachment['server_id'] not in server_ids):
+            server_ids.append(attachment['server_id'])
+
+    # Nova can't list instances by id, so fetch them concurrently instead.
+    def server_get(server_id):
+        return nova.server_get(request, server_id)
+    instances = dict(zip(server_ids, concurrent_map(server_get, server_ids)))
     for attachment in volume_data.attachments:
         if "server_id" in attachment:
-            instance = nova.server_get(request, attachment['server_id'])
+            instance = instances[attachment['server_id']]
             attachment['instance_name'] = instance.name
         else:
             # Nova volume can occasionally send back error'd attachments
@@ -29,12 +29,19 @@ from django.conf import settings
 
 import glanceclient as glance_client
 
+from horizon.utils.instrumentation import instrumented_client
+
+from openstack_dashboard.api.base import cached_catalog
+from openstack_dashboard.api.base import invalidate_catalog
+from openstack_dashboard.api.base import pooled_client
 from openstack_dashboard.api.base import url_for
 
 
 LOG = logging.getLogger(__name__)
 
 
+@instrumented_client('image')
+@pooled_client('image')
 def glanceclient(request):
     o = urlparse.urlparse(url_for(request, 'image'))
     url = "://".join((o.scheme, o.netloc))
@@ -46,7 +53,9 @@ def glanceclient(request):
 
 
 def image_delete(request, image_id):
-    return glanceclient(request).images.delete(image_id)
+    result = glanceclient(request).images.delete(image_id)
+    invalidate_catalog(request, 'images', 'image')
+    return result
 
 
 def image_get(request, image_id):
@@ -70,9 +79,17 @@ def image_list_detailed(request, marker=None, filters=None, paginate=False):
     if marker:
         kwargs['marker'] = marker
 
-    images_iter = glanceclient(request).images.list(page_size=request_size,
-                                                    limit=limit,
-                                                    **kwargs)
+    manager = glanceclient(request).images
+    if not paginate and not marker and kwargs['filters'].get('is_public'):
+        # Public images are the same for every user.
+        images = cached_catalog(request, 'images', 'image', 'global', manager,
+                                lambda: manager.list(page_size=request_size,
+                                                     limit=limit,
+                                                     **kwargs),
+                                variant=sorted(kwargs['filters'].items()))
+        return (images, False)
+
+    images_iter = manager.list(page_size=request_size, limit=limit, **kwargs)
     has_more_data = False
     if paginate:
         images = list(itertools.islice(images_iter, request_size))
@@ -85,7 +102,9 @@ def image_list_detailed(request, marker=None, filters=None, paginate=False):
 
 
 def image_update(request, image_id, **kwargs):
-    return glanceclient(request).images.update(image_id, **kwargs)
+    image = glanceclient(request).images.update(image_id, **kwargs)
+    invalidate_catalog(request, 'images', 'image')
+    return image
 
 
 def image_create(request, **kwargs):
@@ -95,6 +114,7 @@ def image_create(request, **kwargs):
         copy_from = kwargs.pop('copy_from')
 
     image = glanceclient(request).images.create(**kwargs)
+    invalidate_catalog(request, 'images', 'image')
 
     if copy_from:
         thread.start_new_thread(image_update,
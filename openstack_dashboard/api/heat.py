@@ -16,6 +16,7 @@ import logging
 
 from django.conf import settings
 from heatclient import client as heat_client
+from horizon.utils.instrumentation import instrumented_client
 from openstack_dashboard.api.base import url_for
 
 LOG = logging.getLogger(__name__)
@@ -29,6 +30,7 @@ def format_parameters(params):
     return parameters
 
 
+@instrumented_client('orchestration')
 def heatclient(request, password=None):
     api_version = "1"
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
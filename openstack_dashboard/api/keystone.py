@@ -32,6 +32,7 @@ from openstack_auth.backend import KEYSTONE_CLIENT_ATTR
 
 from horizon import exceptions
 from horizon import messages
+from horizon.utils.instrumentation import instrumented_client
 
 from openstack_dashboard.api import base
 
@@ -118,6 +119,7 @@ def _get_endpoint_url(request, endpoint_type, catalog=None):
     return url
 
 
+@instrumented_client('identity')
 def keystoneclient(request, admin=False):
     """Returns a client connected to the Keystone backend.
 
@@ -418,7 +420,9 @@ def remove_group_user(request, group_id, user_id):
 
 def role_create(request, name):
     manager = keystoneclient(request, admin=True).roles
-    return manager.create(name)
+    role = manager.create(name)
+    base.invalidate_catalog(request, 'roles', 'identity')
+    return role
 
 
 def role_get(request, role_id):
@@ -428,17 +432,24 @@ def role_get(request, role_id):
 
 def role_update(request, role_id, name=None):
     manager = keystoneclient(request, admin=True).roles
-    return manager.update(role_id, name)
+    role = manager.update(role_id, name)
+    base.invalidate_catalog(request, 'roles', 'identity')
+    return role
 
 
 def role_delete(request, role_id):
     manager = keystoneclient(request, admin=True).roles
-    return manager.delete(role_id)
+    result = manager.delete(role_id)
+    base.invalidate_catalog(request, 'roles', 'identity')
+    return result
 
 
 def role_list(request):
     """ Returns a global list of available roles. """
-    return keystoneclient(request, admin=True).roles.list()
+    # Building the admin client first checks that the user may list them.
+    manager = keystoneclient(request, admin=True).roles
+    return base.cached_catalog(request, 'roles', 'identity', 'global',
+                               manager, manager.list)
 
 
 def roles_for_user(request, user, project):
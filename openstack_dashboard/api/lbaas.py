@@ -16,13 +16,17 @@
 
 from __future__ import absolute_import
 
+from openstack_dashboard.api import neutron
 from openstack_dashboard.api.neutron import NeutronAPIDictWrapper
 from openstack_dashboard.api.neutron import neutronclient
-from openstack_dashboard.api.neutron import subnet_get
 
 
 class Vip(NeutronAPIDictWrapper):
     """Wrapper for neutron load balancer vip"""
+    _attrs = ['id', 'name', 'description', 'address', 'subnet_id', 'port_id',
+              'protocol_port', 'protocol', 'pool_id', 'connection_limit',
+              'session_persistence', 'admin_state_up', 'status']
+    __slots__ = ()
 
     def __init__(self, apiresource):
         super(Vip, self).__init__(apiresource)
@@ -30,6 +34,10 @@ class Vip(NeutronAPIDictWrapper):
 
 class Pool(NeutronAPIDictWrapper):
     """Wrapper for neutron load balancer pool"""
+    _attrs = ['id', 'name', 'description', 'subnet_id', 'protocol',
+              'lb_method', 'members', 'health_monitors', 'vip_id',
+              'admin_state_up', 'status']
+    __slots__ = ()
 
     def __init__(self, apiresource):
         super(Pool, self).__init__(apiresource)
@@ -42,36 +50,50 @@ class Pool(NeutronAPIDictWrapper):
             self[attr] = value
 
     def readable(self, request):
+        subnets = {}
+        vips = {}
+        try:
+            subnets[self.subnet_id] = neutron.subnet_get(request,
+                                                         self.subnet_id)
+        except Exception:
+            pass
+        if self.vip_id is not None:
+            try:
+                vips[self.vip_id] = vip_get(request, self.vip_id)
+            except Exception:
+                pass
+        return self._readable(subnets, vips)
+
+    def _readable(self, subnets, vips):
+        """
+        Formats the pool using the ``subnets`` and ``vips`` dicts keyed by
+        id. The ids are shown for those which are missing.
+        """
         pFormatted = {'id': self.id,
                       'name': self.name,
                       'description': self.description,
                       'protocol': self.protocol,
                       'health_monitors': self.health_monitors}
-        try:
-            pFormatted['subnet_id'] = self.subnet_id
-            pFormatted['subnet_name'] = subnet_get(
-                request, self.subnet_id).cidr
-        except Exception:
-            pFormatted['subnet_id'] = self.subnet_id
+        pFormatted['subnet_id'] = self.subnet_id
+        if self.subnet_id in subnets:
+            pFormatted['subnet_name'] = subnets[self.subnet_id].cidr
+        else:
             pFormatted['subnet_name'] = self.subnet_id
 
-        if self.vip_id is not None:
-            try:
-                pFormatted['vip_id'] = self.vip_id
-                pFormatted['vip_name'] = vip_get(
-                    request, self.vip_id).name
-            except Exception:
-                pFormatted['vip_id'] = self.vip_id
-                pFormatted['vip_name'] = self.vip_id
+        pFormatted['vip_id'] = self.vip_id
+        if self.vip_id in vips:
+            pFormatted['vip_name'] = vips[self.vip_id].name
         else:
-            pFormatted['vip_id'] = None
-            pFormatted['vip_name'] = None
+            pFormatted['vip_name'] = self.vip_id
 
         return self.AttributeDict(pFormatted)
 
 
 class Member(NeutronAPIDictWrapper):
     """Wrapper for neutron load balancer member"""
+    _attrs = ['id', 'address', 'protocol_port', 'weight', 'pool_id',
+              'admin_state_up', 'status']
+    __slots__ = ()
 
     def __init__(self, apiresource):
         super(Member, self).__init__(apiresource)
@@ -84,15 +106,25 @@ class Member(NeutronAPIDictWrapper):
             self[attr] = value
 
     def readable(self, request):
+        pools = {}
+        try:
+            pools[self.pool_id] = pool_get(request, self.pool_id)
+        except Exception:
+            pass
+        return self._readable(pools)
+
+    def _readable(self, pools):
+        """
+        Formats the member using the ``pools`` dict keyed by id. The id of
+        the pool is shown if it is missing.
+        """
         mFormatted = {'id': self.id,
                       'address': self.address,
                       'protocol_port': self.protocol_port}
-        try:
-            mFormatted['pool_id'] = self.pool_id
-            mFormatted['pool_name'] = pool_get(
-                request, self.pool_id).name
-        except Exception:
-            mFormatted['pool_id'] = self.pool_id
+        mFormatted['pool_id'] = self.pool_id
+        if self.pool_id in pools:
+            mFormatted['pool_name'] = pools[self.pool_id].name
+        else:
             mFormatted['pool_name'] = self.pool_id
 
         return self.AttributeDict(mFormatted)
@@ -100,6 +132,9 @@ class Member(NeutronAPIDictWrapper):
 
 class PoolStats(NeutronAPIDictWrapper):
     """Wrapper for neutron load balancer pool stats"""
+    _attrs = ['bytes_in', 'bytes_out', 'active_connections',
+              'total_connections']
+    __slots__ = ()
 
     def __init__(self, apiresource):
         super(PoolStats, self).__init__(apiresource)
@@ -107,6 +142,9 @@ class PoolStats(NeutronAPIDictWrapper):
 
 class PoolMonitor(NeutronAPIDictWrapper):
     """Wrapper for neutron load balancer pool health monitor"""
+    _attrs = ['id', 'type', 'delay', 'timeout', 'max_retries', 'http_method',
+              'url_path', 'expected_codes', 'admin_state_up', 'status']
+    __slots__ = ()
 
     def __init__(self, apiresource):
         super(PoolMonitor, self).__init__(apiresource)
@@ -184,6 +222,29 @@ def pools_get(request, **kwargs):
     return [Pool(p) for p in pools]
 
 
+def pools_readable(request, pools):
+    """Format pools for display.
+
+    The subnets and vips of all the pools are retrieved with one listing
+    each rather than a call per pool.
+
+    :param request: request context
+    :param pools: list of Pool objects
+    :returns: list of formatted pools
+    """
+    try:
+        subnets = dict((s.id, s) for s in neutron.subnet_list(request))
+    except Exception:
+        subnets = {}
+    vips = {}
+    if any(pool.vip_id is not None for pool in pools):
+        try:
+            vips = dict((v.id, v) for v in vips_get(request))
+        except Exception:
+            pass
+    return [pool._readable(subnets, vips) for pool in pools]
+
+
 def pool_get(request, pool_id):
     pool = neutronclient(request).show_pool(pool_id).get('pool')
     return Pool(pool)
@@ -281,6 +342,25 @@ def members_get(request, **kwargs):
     return [Member(m) for m in members]
 
 
+def members_readable(request, members):
+    """Format members for display.
+
+    The pools of all the members are retrieved with a single listing rather
+    than a call per member.
+
+    :param request: request context
+    :param members: list of Member objects
+    :returns: list of formatted members
+    """
+    pools = {}
+    if members:
+        try:
+            pools = dict((p.id, p) for p in pools_get(request))
+        except Exception:
+            pass
+    return [member._readable(pools) for member in members]
+
+
 def member_get(request, member_id):
     member = neutronclient(request).show_member(member_id).get('member')
     return Member(member)
@@ -27,7 +27,11 @@ from django.conf import settings
 from django.utils.datastructures import SortedDict
 from django.utils.translation import ugettext_lazy as _
 
+from horizon.utils.instrumentation import instrumented_client
+
 from openstack_dashboard.api.base import APIDictWrapper
+from openstack_dashboard.api.base import concurrent_map
+from openstack_dashboard.api.base import pooled_client
 from openstack_dashboard.api.base import url_for
 from openstack_dashboard.api import network_base
 from openstack_dashboard.api import nova
@@ -38,8 +42,13 @@ LOG = logging.getLogger(__name__)
 
 IP_VERSION_DICT = {4: 'IPv4', 6: 'IPv6'}
 
+# The largest number of ids given to a single filtered listing, which keeps
+# the query string within the URL length limits of the API servers.
+MAX_IDS_PER_QUERY = 100
+
 
 class NeutronAPIDictWrapper(APIDictWrapper):
+    __slots__ = ()
 
     def set_id_as_name_if_empty(self, length=8):
         try:
@@ -57,6 +66,10 @@ class NeutronAPIDictWrapper(APIDictWrapper):
 
 class Network(NeutronAPIDictWrapper):
     """Wrapper for neutron Networks"""
+    _attrs = ['id', 'name', 'tenant_id', 'status', 'admin_state_up',
+              'admin_state', 'shared', 'subnets', 'router__external']
+    # Set by the admin dashboard.
+    __slots__ = ('tenant_name',)
 
     def __init__(self, apiresource):
         apiresource['admin_state'] = \
@@ -70,6 +83,10 @@ class Network(NeutronAPIDictWrapper):
 
 class Subnet(NeutronAPIDictWrapper):
     """Wrapper for neutron subnets"""
+    _attrs = ['id', 'name', 'tenant_id', 'network_id', 'cidr', 'ip_version',
+              'ipver_str', 'gateway_ip', 'enable_dhcp', 'allocation_pools',
+              'dns_nameservers', 'host_routes']
+    __slots__ = ()
 
     def __init__(self, apiresource):
         apiresource['ipver_str'] = get_ipver_str(apiresource['ip_version'])
@@ -78,6 +95,10 @@ class Subnet(NeutronAPIDictWrapper):
 
 class Port(NeutronAPIDictWrapper):
     """Wrapper for neutron ports"""
+    _attrs = ['id', 'name', 'tenant_id', 'network_id', 'device_id',
+              'device_owner', 'mac_address', 'fixed_ips', 'status',
+              'admin_state_up', 'admin_state']
+    __slots__ = ()
 
     def __init__(self, apiresource):
         apiresource['admin_state'] = \
@@ -292,13 +313,15 @@ class FloatingIpManager(network_base.FloatingIpManager):
 
     def list(self):
         fips = self.client.list_floatingips().get('floatingips')
-        # Get port list to add instance_id to floating IP list
-        # instance_id is stored in device_id attribute
-        ports = port_list(self.request)
+        # Get the ports of associated floating IPs to add instance_id to
+        # floating IP list. instance_id is stored in device_id attribute
+        port_ids = set(fip['port_id'] for fip in fips if fip['port_id'])
+        ports = _list_by_ids(self.client.list_ports, 'ports', port_ids,
+                             fields=['id', 'device_id'])
         device_id_dict = SortedDict([(p['id'], p['device_id']) for p in ports])
         for fip in fips:
             if fip['port_id']:
-                fip['instance_id'] = device_id_dict[fip['port_id']]
+                fip['instance_id'] = device_id_dict.get(fip['port_id'])
             else:
                 fip['instance_id'] = None
         return [FloatingIp(fip) for fip in fips]
@@ -336,8 +359,11 @@ class FloatingIpManager(network_base.FloatingIpManager):
                                       {'floatingip': update_dict})
 
     def list_targets(self):
-        ports = port_list(self.request)
-        servers, has_more = nova.server_list(self.request)
+        # The ports and servers are listed concurrently.
+        ports, (servers, has_more) = concurrent_map(
+            lambda listing: listing(),
+            [lambda: port_list(self.request),
+             lambda: nova.server_list(self.request)])
         server_dict = SortedDict([(s.id, s.name) for s in servers])
         targets = []
         for p in ports:
@@ -379,6 +405,8 @@ def get_ipver_str(ip_version):
     return IP_VERSION_DICT.get(ip_version, '')
 
 
+@instrumented_client('network')
+@pooled_client('network')
 def neutronclient(request):
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     LOG.debug('neutronclient connection created using token "%s" and url "%s"'
@@ -391,11 +419,25 @@ def neutronclient(request):
     return c
 
 
-def network_list(request, **params):
-    LOG.debug("network_list(): params=%s" % (params))
-    networks = neutronclient(request).list_networks(**params).get('networks')
-    # Get subnet list to expand subnet info in network list.
-    subnets = subnet_list(request)
+def _list_by_ids(list_method, collection, ids, **params):
+    """
+    Returns the resources of ``collection`` with the given ids using as few
+    calls to the client's ``list_method`` as the URL length limits allow.
+    """
+    ids = list(ids)
+    resources = []
+    for start in range(0, len(ids), MAX_IDS_PER_QUERY):
+        response = list_method(id=ids[start:start + MAX_IDS_PER_QUERY],
+                               **params)
+        resources.extend(response.get(collection))
+    return resources
+
+
+def _expand_subnets(networks, subnets):
+    """
+    Wraps the ``networks`` returned by Neutron, replacing the subnet ids of
+    each by the corresponding ones among ``subnets``.
+    """
     subnet_dict = SortedDict([(s['id'], s) for s in subnets])
     # Expand subnet list from subnet_id to values.
     for n in networks:
@@ -403,6 +445,14 @@ def network_list(request, **params):
     return [Network(n) for n in networks]
 
 
+def network_list(request, **params):
+    LOG.debug("network_list(): params=%s" % (params))
+    networks = neutronclient(request).list_networks(**params).get('networks')
+    # Get subnet list to expand subnet info in network list.
+    subnets = subnet_list(request)
+    return _expand_subnets(networks, subnets)
+
+
 def network_list_for_tenant(request, tenant_id, **params):
     """Return a network list available for the tenant.
     The list contains networks owned by the tenant and public networks.
@@ -411,29 +461,40 @@ def network_list_for_tenant(request, tenant_id, **params):
     LOG.debug("network_list_for_tenant(): tenant_id=%s, params=%s"
               % (tenant_id, params))
 
-    # If a user has admin role, network list returned by Neutron API
-    # contains networks that do not belong to that tenant.
-    # So we need to specify tenant_id when calling network_list().
-    networks = network_list(request, tenant_id=tenant_id,
-                            shared=False, **params)
+    def list_networks(search_opts):
+        client = neutronclient(request)
+        return client.list_networks(**search_opts).get('networks')
 
     # In the current Neutron API, there is no way to retrieve
-    # both owner networks and public networks in a single API call.
-    networks += network_list(request, shared=True, **params)
-
-    return networks
+    # both owner networks and public networks in a single API call,
+    # so both listings are made concurrently along with a single listing
+    # of the subnets used to expand them.
+    # If a user has admin role, network list returned by Neutron API
+    # contains networks that do not belong to that tenant.
+    # So we need to specify tenant_id when listing the owned networks.
+    listings = [lambda: list_networks(dict(params, tenant_id=tenant_id,
+                                           shared=False)),
+                lambda: list_networks(dict(params, shared=True)),
+                lambda: subnet_list(request)]
+    owned, shared, subnets = concurrent_map(lambda listing: listing(),
+                                            listings)
+    return _expand_subnets(owned + shared, subnets)
 
 
 def network_get(request, network_id, expand_subnet=True, **params):
     LOG.debug("network_get(): netid=%s, params=%s" % (network_id, params))
-    network = neutronclient(request).show_network(network_id,
-                                                  **params).get('network')
-    # Since the number of subnets per network must be small,
-    # call subnet_get() for each subnet instead of calling
-    # subnet_list() once.
-    if expand_subnet:
-        network['subnets'] = [subnet_get(request, sid)
-                              for sid in network['subnets']]
+    client = neutronclient(request)
+    network = client.show_network(network_id, **params).get('network')
+    # Networks can have many subnets, so they are retrieved with a listing
+    # filtered on their ids rather than a call per subnet.
+    if expand_subnet and network['subnets']:
+        subnets = _list_by_ids(client.list_subnets, 'subnets',
+                               network['subnets'])
+        subnet_dict = SortedDict([(s['id'], s) for s in subnets])
+        # A subnet deleted in the meantime is left out.
+        network['subnets'] = [Subnet(subnet_dict[sid])
+                              for sid in network['subnets']
+                              if sid in subnet_dict]
     return Network(network)
 
 
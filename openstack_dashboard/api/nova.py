@@ -34,11 +34,16 @@ from novaclient.v1_1.security_groups import SecurityGroup as NovaSecurityGroup
 from novaclient.v1_1.servers import REBOOT_HARD
 
 from horizon.conf import HORIZON_CONFIG
-from horizon.utils.memoized import memoized
+from horizon.utils.instrumentation import instrumented_client
+from horizon.utils.memoized import request_memoized
 
 from openstack_dashboard.api.base import APIDictWrapper
 from openstack_dashboard.api.base import APIResourceWrapper
 from openstack_dashboard.api.base import QuotaSet
+from openstack_dashboard.api.base import cached_catalog
+from openstack_dashboard.api.base import concurrent_map
+from openstack_dashboard.api.base import invalidate_catalog
+from openstack_dashboard.api.base import pooled_client
 from openstack_dashboard.api.base import url_for
 from openstack_dashboard.api import network_base
 
@@ -77,6 +82,8 @@ class Server(APIResourceWrapper):
              'tenant_id', 'user_id', 'OS-EXT-STS:power_state',
              'OS-EXT-STS:task_state', 'OS-EXT-SRV-ATTR:instance_name',
              'OS-EXT-SRV-ATTR:host', 'created']
+    # The dashboards attach attributes of their own, such as the flavor.
+    __slots__ = ('request', '__dict__')
 
     def __init__(self, apiresource, request):
         super(Server, self).__init__(apiresource)
@@ -84,15 +91,13 @@ class Server(APIResourceWrapper):
 
     @property
     def image_name(self):
-        import glanceclient.exc as glance_exceptions
-        from openstack_dashboard.api import glance
         if not self.image:
             return "(not found)"
-        try:
-            image = glance.image_get(self.request, self.image['id'])
-            return image.name
-        except glance_exceptions.ClientException:
+        name = server_image_names(self.request).get(self.request,
+                                                    self.image['id'])
+        if name is None:
             return "(not found)"
+        return name
 
     @property
     def internal_name(self):
@@ -102,6 +107,66 @@ class Server(APIResourceWrapper):
         novaclient(self.request).servers.reboot(self.id, hardness)
 
 
+class ServerImageNames(object):
+    """
+    The names of the images of the servers listed during a request. The
+    images of all the servers listed are looked up together, through the
+    listings of the public and project images, the first time the name of
+    one of them is needed. Images missing from those listings are then
+    fetched one by one.
+    """
+    def __init__(self):
+        # Image id -> name, or None if the image can't be found.
+        self.names = {}
+        self.pending = set()
+
+    def add_servers(self, servers):
+        for server in servers:
+            if server.image and server.image['id'] not in self.names:
+                self.pending.add(server.image['id'])
+
+    def get(self, request, image_id):
+        import glanceclient.exc as glance_exceptions
+        from openstack_dashboard.api import glance
+        if image_id not in self.names:
+            self.pending.add(image_id)
+            if len(self.pending) > 1:
+                self.list_pending(request)
+        if image_id not in self.names:
+            self.pending.discard(image_id)
+            try:
+                image = glance.image_get(request, image_id)
+                self.names[image_id] = image.name
+            except glance_exceptions.ClientException:
+                self.names[image_id] = None
+        return self.names[image_id]
+
+    def list_pending(self, request):
+        import glanceclient.exc as glance_exceptions
+        from openstack_dashboard.api import glance
+        pending, self.pending = self.pending, set()
+        # The listing of public images is cached across requests.
+        for filters in ({'is_public': True},
+                        {'property-owner_id': request.user.tenant_id}):
+            if not pending:
+                break
+            try:
+                images, _more = glance.image_list_detailed(request,
+                                                           filters=filters)
+            except glance_exceptions.ClientException:
+                continue
+            for image in images:
+                if image.id in pending:
+                    self.names[image.id] = image.name
+                    pending.discard(image.id)
+
+
+@request_memoized
+def server_image_names(request):
+    """ Returns the :class:`ServerImageNames` of ``request``. """
+    return ServerImageNames()
+
+
 class NovaUsage(APIResourceWrapper):
     """Simple wrapper around contrib/simple_usage.py."""
     _attrs = ['start', 'server_usages', 'stop', 'tenant_id',
@@ -342,6 +407,8 @@ class FloatingIpManager(network_base.FloatingIpManager):
         return HORIZON_CONFIG["simple_ip_management"]
 
 
+@instrumented_client('compute')
+@pooled_client('compute')
 def novaclient(request):
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     LOG.debug('novaclient connection created using token "%s" and url "%s"' %
@@ -373,6 +440,7 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
                                                 flavorid=flavorid,
                                                 ephemeral=ephemeral,
                                                 swap=swap)
+    invalidate_catalog(request, 'flavors', 'compute')
     if (metadata):
         flavor_extra_set(request, flavor.id, metadata)
     return flavor
@@ -380,16 +448,20 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
 
 def flavor_delete(request, flavor_id):
     novaclient(request).flavors.delete(flavor_id)
+    invalidate_catalog(request, 'flavors', 'compute')
 
 
 def flavor_get(request, flavor_id):
     return novaclient(request).flavors.get(flavor_id)
 
 
-@memoized
+@request_memoized
 def flavor_list(request):
     """Get the list of available instance sizes (flavors)."""
-    return novaclient(request).flavors.list()
+    # Private flavors are only listed for the projects they are shared with.
+    manager = novaclient(request).flavors
+    return cached_catalog(request, 'flavors', 'compute', 'project', manager,
+                          manager.list)
 
 
 def flavor_get_extras(request, flavor_id, raw=False):
@@ -473,6 +545,7 @@ def server_list(request, search_opts=None, all_tenants=False):
         search_opts['project_id'] = request.user.tenant_id
     servers = [Server(s, request)
                 for s in novaclient(request).servers.list(True, search_opts)]
+    server_image_names(request).add_servers(servers)
 
     has_more_data = False
     if paginate and len(servers) > page_size:
@@ -593,8 +666,11 @@ def instance_volumes_list(request, instance_id):
 
     volumes = novaclient(request).volumes.get_server_volumes(instance_id)
 
-    for volume in volumes:
-        volume_data = cinderclient(request).volumes.get(volume.id)
+    # Cinder can't list volumes by id, so fetch them concurrently instead.
+    def volume_get(volume):
+        return cinderclient(request).volumes.get(volume.id)
+    for volume, volume_data in zip(volumes, concurrent_map(volume_get,
+                                                           volumes)):
         volume.name = volume_data.display_name
 
     return volumes
@@ -621,7 +697,12 @@ def tenant_absolute_limits(request, reserved=False):
 
 
 def availability_zone_list(request, detailed=False):
-    return novaclient(request).availability_zones.list(detailed=detailed)
+    # The details, such as the hosts of each zone, are only shown to admins.
+    manager = novaclient(request).availability_zones
+    return cached_catalog(request, 'availability_zones', 'compute',
+                          'token' if detailed else 'global', manager,
+                          lambda: manager.list(detailed=detailed),
+                          variant=detailed)
 
 
 def service_list(request):
@@ -629,19 +710,30 @@ def service_list(request):
 
 
 def aggregate_list(request):
-    result = []
-    for aggregate in novaclient(request).aggregates.list():
-        result.append(novaclient(request).aggregates.get(aggregate.id))
-
-    return result
-
-
-@memoized
+    aggregates = novaclient(request).aggregates.list()
+    # The listing normally carries the hosts and metadata already; only
+    # fetch the details of the aggregates it doesn't give them for.
+    incomplete = [index for index, aggregate in enumerate(aggregates)
+                  if 'hosts' not in aggregate._info
+                  or 'metadata' not in aggregate._info]
+    if incomplete:
+        def aggregate_get(index):
+            return novaclient(request).aggregates.get(aggregates[index].id)
+        for index, aggregate in zip(incomplete,
+                                    concurrent_map(aggregate_get,
+                                                   incomplete)):
+            aggregates[index] = aggregate
+    return aggregates
+
+
+@request_memoized
 def list_extensions(request):
-    return ListExtManager(novaclient(request)).show_all()
+    manager = ListExtManager(novaclient(request))
+    return cached_catalog(request, 'extensions', 'compute', 'global', manager,
+                          manager.show_all)
 
 
-@memoized
+@request_memoized
 def extension_supported(extension_name, request):
     """
     this method will determine if nova supports a given extension name.
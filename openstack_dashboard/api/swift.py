@@ -27,8 +27,10 @@ from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon import messages
+from horizon.utils.instrumentation import instrumented_client
 
 from openstack_dashboard.api.base import APIDictWrapper
+from openstack_dashboard.api.base import pooled_client
 from openstack_dashboard.api.base import url_for
 
 
@@ -41,6 +43,10 @@ class Container(APIDictWrapper):
 
 
 class StorageObject(APIDictWrapper):
+    _attrs = ['name', 'bytes', 'content_type', 'hash', 'last_modified']
+    # MixedDataTableView sets the data type of the objects it lists.
+    __slots__ = ('container_name', 'orig_name', 'data', '__dict__')
+
     def __init__(self, apidict, container_name, orig_name=None, data=None):
         super(StorageObject, self).__init__(apidict)
         self.container_name = container_name
@@ -53,6 +59,10 @@ class StorageObject(APIDictWrapper):
 
 
 class PseudoFolder(APIDictWrapper):
+    _attrs = ['subdir']
+    # MixedDataTableView sets the data type of the objects it lists.
+    __slots__ = ('container_name', '__dict__')
+
     def __init__(self, apidict, container_name):
         super(PseudoFolder, self).__init__(apidict)
         self.container_name = container_name
@@ -90,6 +100,8 @@ def _objectify(items, container_name):
     return objects
 
 
+@instrumented_client('object-store')
+@pooled_client('object-store')
 def swift_api(request):
     endpoint = url_for(request, 'object-store')
     LOG.debug('Swift connection created using token "%s" and url "%s"'
@@ -17,6 +17,8 @@
 from troveclient.auth import ServiceCatalog
 from troveclient import client
 
+from horizon.utils.instrumentation import instrumented_client
+
 
 class TokenAuth(object):
     """Simple Token Authentication handler for trove api"""
@@ -42,6 +44,7 @@ class TokenAuth(object):
                               service_name=self.service_name)
 
 
+@instrumented_client('database')
 def troveclient(request):
     return client.Dbaas(username=request.user,
                         api_key=None,
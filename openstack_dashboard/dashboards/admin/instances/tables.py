@@ -16,6 +16,7 @@
 #    under the License.
 
 import logging
+import re
 
 from django.template.defaultfilters import timesince
 from django.template.defaultfilters import title
@@ -89,6 +90,8 @@ class MigrateInstance(tables.BatchAction):
 
 
 class AdminUpdateRow(UpdateRow):
+    __slots__ = ()
+
     def get_data(self, request, instance_id):
         instance = super(AdminUpdateRow, self).get_data(request, instance_id)
         tenant = api.keystone.tenant_get(request,
@@ -97,6 +100,18 @@ class AdminUpdateRow(UpdateRow):
         instance.tenant_name = getattr(tenant, "name", None)
         return instance
 
+    def get_data_many(self, request, instance_ids):
+        instances = super(AdminUpdateRow, self).get_data_many(request,
+                                                              instance_ids)
+        tenants = {}
+        for instance in instances.values():
+            if instance.tenant_id not in tenants:
+                tenants[instance.tenant_id] = api.keystone.tenant_get(
+                    request, instance.tenant_id, admin=True)
+            tenant = tenants[instance.tenant_id]
+            instance.tenant_name = getattr(tenant, "name", None)
+        return instances
+
 
 class AdminInstanceFilterAction(tables.FilterAction):
     def filter(self, table, instances, filter_string):
@@ -105,6 +120,10 @@ class AdminInstanceFilterAction(tables.FilterAction):
         return [instance for instance in instances
                 if q in instance.name.lower()]
 
+    def api_filter(self, table, filter_string):
+        # Nova matches the name filter as a regular expression.
+        return {'name': re.escape(filter_string)}
+
 
 class AdminInstancesTable(tables.DataTable):
     TASK_STATUS_CHOICES = (
@@ -14,11 +14,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
 import uuid
 
 from django.core.urlresolvers import reverse
 from django import http
+from django.test.utils import override_settings
 from django.utils.datastructures import SortedDict
+from django.utils.http import urlencode
 
 from mox import IsA
 
@@ -50,6 +53,42 @@ class InstanceViewTest(test.BaseAdminViewTests):
         instances = res.context['table'].data
         self.assertItemsEqual(instances, servers)
 
+    @override_settings(OPENSTACK_API_CONCURRENCY=1)
+    @test.create_stubs({api.nova: ('server_get', 'flavor_list',
+                                   'extension_supported',),
+                        api.keystone: ('tenant_get',)})
+    def test_index_rows_update(self):
+        servers = self.servers.list()[:2]
+        tenant = self.tenants.first()
+        api.nova.extension_supported('AdminActions', IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        # The instances are retrieved by id whatever their tenant.
+        for server in servers:
+            api.nova.server_get(IsA(http.HttpRequest), server.id) \
+                .AndReturn(server)
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
+        api.keystone.tenant_get(IsA(http.HttpRequest), tenant.id,
+                                admin=True).AndReturn(tenant)
+        self.mox.ReplayAll()
+
+        params = urlencode({'table': 'instances',
+                            'action': 'rows_update',
+                            'obj_id': [server.id for server in servers]},
+                           doseq=True)
+        res = self.client.get("%s?%s"
+                              % (reverse('horizon:admin:instances:index'),
+                                 params),
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertEqual(res.status_code, 200)
+        content = json.loads(res.content)
+        self.assertItemsEqual(content['rows'].keys(),
+                              [server.id for server in servers])
+        self.assertEqual(content['errors'], {})
+        for server in servers:
+            self.assertEqual(server.tenant_name, tenant.name)
+
     @test.create_stubs({api.nova: ('flavor_list', 'flavor_get',
                                     'server_list', 'extension_supported',),
                         api.keystone: ('tenant_list',)})
@@ -74,11 +74,12 @@ class AdminIndexView(tables.DataTableView):
         instances = []
         marker = self.request.GET.get(
                         AdminInstancesTable._meta.pagination_param, None)
+        search_opts = {'marker': marker, 'paginate': True}
+        search_opts.update(self.get_table().get_api_filter() or {})
         try:
             instances, self._more = api.nova.server_list(
                                         self.request,
-                                        search_opts={'marker': marker,
-                                                     'paginate': True},
+                                        search_opts=search_opts,
                                         all_tenants=True)
         except Exception:
             self._more = False
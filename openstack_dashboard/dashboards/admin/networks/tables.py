@@ -16,6 +16,7 @@
 
 import logging
 
+from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.template import defaultfilters as filters
 from django.utils.translation import ugettext_lazy as _
@@ -80,3 +81,4 @@ class NetworksTable(tables.DataTable):
         verbose_name = _("Networks")
         table_actions = (CreateNetwork, DeleteNetwork)
         row_actions = (EditNetwork, DeleteNetwork)
+        page_size = getattr(settings, 'API_RESULT_PAGE_SIZE', 20)
@@ -44,6 +44,7 @@ class DeleteRouter(r_tables.DeleteRouter):
 
 
 class UpdateRow(tables.Row):
+    __slots__ = ()
     ajax = True
 
     def get_data(self, request, router_id):
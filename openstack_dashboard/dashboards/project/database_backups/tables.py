@@ -73,6 +73,7 @@ class DeleteBackup(tables.BatchAction):
 
 
 class UpdateRow(tables.Row):
+    __slots__ = ()
     ajax = True
 
     def get_data(self, request, backup_id):
@@ -136,6 +136,7 @@ class CreateBackup(tables.LinkAction):
 
 
 class UpdateRow(tables.Row):
+    __slots__ = ()
     ajax = True
 
     def get_data(self, request, instance_id):
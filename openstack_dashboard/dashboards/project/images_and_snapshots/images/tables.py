@@ -171,6 +171,7 @@ def get_format(image):
 
 
 class UpdateRow(tables.Row):
+    __slots__ = ()
     ajax = True
 
     def get_data(self, request, image_id):
@@ -58,6 +58,7 @@ class CreateVolumeFromSnapshot(tables.LinkAction):
 
 
 class UpdateRow(tables.Row):
+    __slots__ = ()
     ajax = True
 
     def get_data(self, request, snapshot_id):
@@ -33,6 +33,7 @@ from horizon.utils.filters import parse_isotime
 from horizon.utils.filters import replace_underscores
 
 import logging
+import re
 
 from openstack_dashboard import api
 from openstack_dashboard.dashboards.project.access_and_security \
@@ -436,6 +437,7 @@ class SimpleDisassociateIP(tables.Action):
 
 
 class UpdateRow(tables.Row):
+    __slots__ = ()
     ajax = True
 
     def get_data(self, request, instance_id):
@@ -444,6 +446,35 @@ class UpdateRow(tables.Row):
                                                    instance.flavor["id"])
         return instance
 
+    def get_instance(self, request, instance_id):
+        """ Returns the instance, or ``None`` if it no longer exists. """
+        try:
+            return api.nova.server_get(request, instance_id)
+        except Exception:
+            error = exceptions.handle(request, ignore=True)
+            if error is not exceptions.NotFound:
+                raise
+        return None
+
+    def get_data_many(self, request, instance_ids):
+        # Nova cannot list servers by id, so only the polled instances are
+        # retrieved, concurrently, and share a single flavor listing.
+        instances = api.base.concurrent_map(
+            lambda instance_id: self.get_instance(request, instance_id),
+            instance_ids)
+        instances = dict([(instance_id, instance) for instance_id, instance
+                          in zip(instance_ids, instances) if instance])
+        if not instances:
+            return instances
+        flavors = dict([(str(flavor.id), flavor)
+                        for flavor in api.nova.flavor_list(request)])
+        for instance in instances.values():
+            flavor_id = str(instance.flavor["id"])
+            if flavor_id not in flavors:
+                flavors[flavor_id] = api.nova.flavor_get(request, flavor_id)
+            instance.full_flavor = flavors[flavor_id]
+        return instances
+
 
 class StartInstance(tables.BatchAction):
     name = "start"
@@ -532,6 +563,10 @@ class InstancesFilterAction(tables.FilterAction):
         return [instance for instance in instances
                 if q in instance.name.lower()]
 
+    def api_filter(self, table, filter_string):
+        # Nova matches the name filter as a regular expression.
+        return {'name': re.escape(filter_string)}
+
 
 class InstancesTable(tables.DataTable):
     TASK_STATUS_CHOICES = (
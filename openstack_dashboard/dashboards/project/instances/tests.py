@@ -18,10 +18,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
 import uuid
 
 from django.core.urlresolvers import reverse
 from django import http
+from django.test.utils import override_settings
 from django.utils.datastructures import SortedDict
 from django.utils.http import urlencode
 
@@ -42,6 +44,7 @@ from openstack_dashboard.dashboards.project.instances.workflows \
 from openstack_dashboard.dashboards.project.instances.workflows \
     import update_instance
 
+from novaclient import exceptions as nova_exceptions
 from novaclient.v1_1.servers import REBOOT_HARD
 from novaclient.v1_1.servers import REBOOT_SOFT
 
@@ -161,6 +164,62 @@ class InstanceTests(test.TestCase):
         self.assertMessageCount(res, error=len(servers))
         self.assertItemsEqual(instances, self.servers.list())
 
+    @test.create_stubs({api.nova: ('flavor_list',
+                                   'server_list',
+                                   'tenant_absolute_limits',
+                                   'extension_supported',)})
+    def test_index_filter(self):
+        servers = self.servers.list()[:1]
+        api.nova.extension_supported('AdminActions',
+                                     IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
+        search_opts = {'marker': None, 'paginate': True, 'name': 'server'}
+        api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
+            .AndReturn([servers, False])
+        api.nova.tenant_absolute_limits(IsA(http.HttpRequest), reserved=True) \
+           .MultipleTimes().AndReturn(self.limits['absolute'])
+
+        self.mox.ReplayAll()
+
+        res = self.client.post(INDEX_URL, {'instances__filter__q': 'server'})
+
+        self.assertTemplateUsed(res, 'project/instances/index.html')
+        instances = res.context['instances_table'].filtered_data
+        self.assertItemsEqual(instances, servers)
+
+    @override_settings(OPENSTACK_API_CONCURRENCY=1)
+    @test.create_stubs({api.nova: ('server_get',
+                                   'flavor_list',
+                                   'extension_supported',)})
+    def test_index_rows_update(self):
+        servers = self.servers.list()
+        api.nova.extension_supported('AdminActions',
+                                     IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        # Only the polled instances are retrieved.
+        api.nova.server_get(IsA(http.HttpRequest), servers[0].id) \
+            .AndReturn(servers[0])
+        api.nova.server_get(IsA(http.HttpRequest), servers[1].id) \
+            .AndRaise(nova_exceptions.NotFound(404, "Not found."))
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
+
+        self.mox.ReplayAll()
+
+        params = urlencode({'table': 'instances',
+                            'action': 'rows_update',
+                            'obj_id': [servers[0].id, servers[1].id]},
+                           doseq=True)
+        res = self.client.get("%s?%s" % (INDEX_URL, params),
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertEqual(res.status_code, 200)
+        content = json.loads(res.content)
+        self.assertEqual(content['rows'].keys(), [servers[0].id])
+        self.assertEqual(content['errors'], {servers[1].id: 404})
+
     @test.create_stubs({api.nova: ('server_list',
                                    'flavor_list',
                                    'server_delete',)})
@@ -817,7 +876,7 @@ class InstanceTests(test.TestCase):
                         api.network: ('security_group_list',),
                         cinder: ('volume_snapshot_list',
                                  'volume_list',),
-                        api.neutron: ('network_list',),
+                        api.neutron: ('network_list_for_tenant',),
                         api.glance: ('image_list_detailed',)})
     def test_launch_instance_get(self):
         image = self.images.first()
@@ -834,13 +893,9 @@ class InstanceTests(test.TestCase):
                             filters={'property-owner_id': self.tenant.id,
                                      'status': 'active'}) \
                 .AndReturn([[], False])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 tenant_id=self.tenant.id,
-                                 shared=False) \
-                .AndReturn(self.networks.list()[:1])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 shared=True) \
-                .AndReturn(self.networks.list()[1:])
+        api.neutron.network_list_for_tenant(IsA(http.HttpRequest),
+                                            self.tenant.id) \
+                .AndReturn(self.networks.list())
         api.nova.tenant_absolute_limits(IsA(http.HttpRequest))\
                 .AndReturn(self.limits['absolute'])
         api.nova.flavor_list(IsA(http.HttpRequest)) \
@@ -874,7 +929,7 @@ class InstanceTests(test.TestCase):
                              '<PostCreationStep: customizeaction>'])
 
     @test.create_stubs({api.glance: ('image_list_detailed',),
-                        api.neutron: ('network_list',),
+                        api.neutron: ('network_list_for_tenant',),
                         api.nova: ('flavor_list',
                                    'keypair_list',
                                    'availability_zone_list',
@@ -908,13 +963,9 @@ class InstanceTests(test.TestCase):
                             filters={'property-owner_id': self.tenant.id,
                                      'status': 'active'}) \
                   .AndReturn([[], False])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 tenant_id=self.tenant.id,
-                                 shared=False) \
-                .AndReturn(self.networks.list()[:1])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 shared=True) \
-                .AndReturn(self.networks.list()[1:])
+        api.neutron.network_list_for_tenant(IsA(http.HttpRequest),
+                                            self.tenant.id) \
+                .AndReturn(self.networks.list())
         cinder.volume_list(IsA(http.HttpRequest)) \
                 .AndReturn([])
         cinder.volume_snapshot_list(IsA(http.HttpRequest)).AndReturn([])
@@ -953,7 +1004,7 @@ class InstanceTests(test.TestCase):
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
     @test.create_stubs({api.glance: ('image_list_detailed',),
-                        api.neutron: ('network_list',),
+                        api.neutron: ('network_list_for_tenant',),
                         api.nova: ('flavor_list',
                                    'tenant_absolute_limits',
                                    'keypair_list',
@@ -985,13 +1036,9 @@ class InstanceTests(test.TestCase):
                             filters={'property-owner_id': self.tenant.id,
                                      'status': 'active'}) \
                 .AndReturn([self.images.list(), False])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 tenant_id=self.tenant.id,
-                                 shared=False) \
-                .AndReturn(self.networks.list()[:1])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 shared=True) \
-                .AndReturn(self.networks.list()[1:])
+        api.neutron.network_list_for_tenant(IsA(http.HttpRequest),
+                                            self.tenant.id) \
+                .AndReturn(self.networks.list())
         api.nova.flavor_list(IsA(http.HttpRequest)) \
                 .AndReturn(self.flavors.list())
         api.nova.keypair_list(IsA(http.HttpRequest)) \
@@ -1033,7 +1080,7 @@ class InstanceTests(test.TestCase):
         self.assertTemplateUsed(res, WorkflowView.template_name)
 
     @test.create_stubs({api.glance: ('image_list_detailed',),
-                        api.neutron: ('network_list',),
+                        api.neutron: ('network_list_for_tenant',),
                         api.nova: ('flavor_list',
                                    'keypair_list',
                                    'availability_zone_list',
@@ -1070,13 +1117,9 @@ class InstanceTests(test.TestCase):
                             filters={'property-owner_id': self.tenant.id,
                                      'status': 'active'}) \
                   .AndReturn([[], False])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 tenant_id=self.tenant.id,
-                                 shared=False) \
-                .AndReturn(self.networks.list()[:1])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 shared=True) \
-                .AndReturn(self.networks.list()[1:])
+        api.neutron.network_list_for_tenant(IsA(http.HttpRequest),
+                                            self.tenant.id) \
+                .AndReturn(self.networks.list())
         cinder.volume_list(IsA(http.HttpRequest)) \
                 .AndReturn(self.volumes.list())
         cinder.volume_snapshot_list(IsA(http.HttpRequest)).AndReturn([])
@@ -1116,7 +1159,7 @@ class InstanceTests(test.TestCase):
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
     @test.create_stubs({api.glance: ('image_list_detailed',),
-                        api.neutron: ('network_list',),
+                        api.neutron: ('network_list_for_tenant',),
                         api.nova: ('server_create',
                                    'flavor_list',
                                    'keypair_list',
@@ -1153,13 +1196,9 @@ class InstanceTests(test.TestCase):
                             filters={'property-owner_id': self.tenant.id,
                                      'status': 'active'}) \
                   .AndReturn([[], False])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 tenant_id=self.tenant.id,
-                                 shared=False) \
-                .AndReturn(self.networks.list()[:1])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 shared=True) \
-                .AndReturn(self.networks.list()[1:])
+        api.neutron.network_list_for_tenant(IsA(http.HttpRequest),
+                                            self.tenant.id) \
+                .AndReturn(self.networks.list())
         cinder.volume_list(IsA(http.HttpRequest)) \
                 .AndReturn(self.volumes.list())
         cinder.volume_snapshot_list(IsA(http.HttpRequest)).AndReturn([])
@@ -1201,7 +1240,7 @@ class InstanceTests(test.TestCase):
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
     @test.create_stubs({api.glance: ('image_list_detailed',),
-                        api.neutron: ('network_list',),
+                        api.neutron: ('network_list_for_tenant',),
                         api.nova: ('flavor_list',
                                    'keypair_list',
                                    'availability_zone_list',
@@ -1229,13 +1268,9 @@ class InstanceTests(test.TestCase):
                             filters={'property-owner_id': self.tenant.id,
                                      'status': 'active'}) \
                 .AndReturn([[], False])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 tenant_id=self.tenant.id,
-                                 shared=False) \
-                .AndReturn(self.networks.list()[:1])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 shared=True) \
-                .AndReturn(self.networks.list()[1:])
+        api.neutron.network_list_for_tenant(IsA(http.HttpRequest),
+                                            self.tenant.id) \
+                .AndReturn(self.networks.list())
         api.nova.flavor_list(IsA(http.HttpRequest)) \
                 .AndReturn(self.flavors.list())
         api.nova.keypair_list(IsA(http.HttpRequest)) \
@@ -1273,7 +1308,7 @@ class InstanceTests(test.TestCase):
         self.assertTemplateUsed(res, WorkflowView.template_name)
 
     @test.create_stubs({api.glance: ('image_list_detailed',),
-                        api.neutron: ('network_list',),
+                        api.neutron: ('network_list_for_tenant',),
                         cinder: ('volume_list',
                                  'volume_snapshot_list',),
                         api.network: ('security_group_list',),
@@ -1294,13 +1329,9 @@ class InstanceTests(test.TestCase):
                             filters={'property-owner_id': self.tenant.id,
                                      'status': 'active'}) \
                   .AndReturn([[], False])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 tenant_id=self.tenant.id,
-                                 shared=False) \
-                .AndReturn(self.networks.list()[:1])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 shared=True) \
-                .AndReturn(self.networks.list()[1:])
+        api.neutron.network_list_for_tenant(IsA(http.HttpRequest),
+                                            self.tenant.id) \
+                .AndReturn(self.networks.list())
         api.nova.tenant_absolute_limits(IsA(http.HttpRequest)) \
            .AndReturn(self.limits['absolute'])
         api.nova.flavor_list(IsA(http.HttpRequest)) \
@@ -1322,7 +1353,7 @@ class InstanceTests(test.TestCase):
         self.assertTemplateUsed(res, WorkflowView.template_name)
 
     @test.create_stubs({api.glance: ('image_list_detailed',),
-                        api.neutron: ('network_list',),
+                        api.neutron: ('network_list_for_tenant',),
                         api.nova: ('flavor_list',
                                    'keypair_list',
                                    'availability_zone_list',
@@ -1356,13 +1387,9 @@ class InstanceTests(test.TestCase):
                             filters={'property-owner_id': self.tenant.id,
                                      'status': 'active'}) \
                   .AndReturn([[], False])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 tenant_id=self.tenant.id,
-                                 shared=False) \
-                .AndReturn(self.networks.list()[:1])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 shared=True) \
-                .AndReturn(self.networks.list()[1:])
+        api.neutron.network_list_for_tenant(IsA(http.HttpRequest),
+                                            self.tenant.id) \
+                .AndReturn(self.networks.list())
         cinder.volume_list(IgnoreArg()).AndReturn(self.volumes.list())
         api.nova.server_create(IsA(http.HttpRequest),
                                server.name,
@@ -1401,7 +1428,7 @@ class InstanceTests(test.TestCase):
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
     @test.create_stubs({api.glance: ('image_list_detailed',),
-                        api.neutron: ('network_list',),
+                        api.neutron: ('network_list_for_tenant',),
                         api.nova: ('flavor_list',
                                    'keypair_list',
                                    'tenant_absolute_limits',
@@ -1437,13 +1464,9 @@ class InstanceTests(test.TestCase):
                             filters={'property-owner_id': self.tenant.id,
                                      'status': 'active'}) \
                   .AndReturn([[], False])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 tenant_id=self.tenant.id,
-                                 shared=False) \
-                .AndReturn(self.networks.list()[:1])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 shared=True) \
-                .AndReturn(self.networks.list()[1:])
+        api.neutron.network_list_for_tenant(IsA(http.HttpRequest),
+                                            self.tenant.id) \
+                .AndReturn(self.networks.list())
         cinder.volume_list(IsA(http.HttpRequest)) \
                 .AndReturn(self.volumes.list())
         cinder.volume_snapshot_list(IsA(http.HttpRequest)).AndReturn([])
@@ -1537,7 +1560,7 @@ class InstanceTests(test.TestCase):
                         api.network: ('security_group_list',),
                         cinder: ('volume_snapshot_list',
                                  'volume_list',),
-                        api.neutron: ('network_list',),
+                        api.neutron: ('network_list_for_tenant',),
                         api.glance: ('image_list_detailed',)})
     def test_select_default_keypair_if_only_one(self):
         keypair = self.keypairs.first()
@@ -1554,13 +1577,9 @@ class InstanceTests(test.TestCase):
                             filters={'property-owner_id': self.tenant.id,
                                      'status': 'active'}) \
                 .AndReturn([[], False])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 tenant_id=self.tenant.id,
-                                 shared=False) \
-                .AndReturn(self.networks.list()[:1])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 shared=True) \
-                .AndReturn(self.networks.list()[1:])
+        api.neutron.network_list_for_tenant(IsA(http.HttpRequest),
+                                            self.tenant.id) \
+                .AndReturn(self.networks.list())
         api.nova.tenant_absolute_limits(IsA(http.HttpRequest)) \
            .AndReturn(self.limits['absolute'])
         api.nova.flavor_list(IsA(http.HttpRequest)) \
@@ -64,12 +64,13 @@ class IndexView(tables.DataTableView):
     def get_data(self):
         marker = self.request.GET.get(
                         InstancesTable._meta.pagination_param, None)
+        search_opts = {'marker': marker, 'paginate': True}
+        search_opts.update(self.get_table().get_api_filter() or {})
         # Gather our instances
         try:
             instances, self._more = api.nova.server_list(
                                         self.request,
-                                        search_opts={'marker': marker,
-                                                     'paginate': True})
+                                        search_opts=search_opts)
         except Exception:
             self._more = False
             instances = []
@@ -39,8 +39,8 @@ class PoolsTab(tabs.TableTab):
     def get_poolstable_data(self):
         try:
             pools = api.lbaas.pools_get(self.tab_group.request)
-            poolsFormatted = [p.readable(self.tab_group.request) for
-                              p in pools]
+            poolsFormatted = api.lbaas.pools_readable(
+                self.tab_group.request, pools)
         except Exception:
             poolsFormatted = []
             exceptions.handle(self.tab_group.request,
@@ -57,8 +57,8 @@ class MembersTab(tabs.TableTab):
     def get_memberstable_data(self):
         try:
             members = api.lbaas.members_get(self.tab_group.request)
-            membersFormatted = [m.readable(self.tab_group.request) for
-                                m in members]
+            membersFormatted = api.lbaas.members_readable(
+                self.tab_group.request, members)
         except Exception:
             membersFormatted = []
             exceptions.handle(self.tab_group.request,
@@ -59,29 +59,21 @@ class LoadBalancerTests(test.TestCase):
     DELETEASSOC_PATH = 'horizon:%s:loadbalancers:deleteassociation' % DASHBOARD
 
     def set_up_expect(self):
-        # retrieve pools
-        vip1 = self.vips.first()
-
-        vip2 = self.vips.list()[1]
-
+        # retrieve pools, once for the pools and once for the members
         api.lbaas.pools_get(
-            IsA(http.HttpRequest)).AndReturn(self.pools.list())
+            IsA(http.HttpRequest)).MultipleTimes() \
+                .AndReturn(self.pools.list())
 
-        api.lbaas.vip_get(IsA(http.HttpRequest), vip1.id).AndReturn(vip1)
-        api.lbaas.vip_get(IsA(http.HttpRequest), vip2.id).AndReturn(vip2)
+        # the subnets and vips of the pools are listed once
+        api.neutron.subnet_list(
+            IsA(http.HttpRequest)).AndReturn(self.subnets.list())
+        api.lbaas.vips_get(
+            IsA(http.HttpRequest)).AndReturn(self.vips.list())
 
         # retrieves members
         api.lbaas.members_get(
             IsA(http.HttpRequest)).AndReturn(self.members.list())
 
-        pool1 = self.pools.first()
-        pool2 = self.pools.list()[1]
-
-        api.lbaas.pool_get(IsA(http.HttpRequest),
-                           self.members.list()[0].pool_id).AndReturn(pool1)
-        api.lbaas.pool_get(IsA(http.HttpRequest),
-                           self.members.list()[1].pool_id).AndReturn(pool2)
-
         # retrieves monitors
         api.lbaas.pool_health_monitors_get(
             IsA(http.HttpRequest)).MultipleTimes() \
@@ -95,10 +87,10 @@ class LoadBalancerTests(test.TestCase):
         api.lbaas.pool_health_monitors_get(
             IsA(http.HttpRequest)).AndRaise(self.exceptions.neutron)
 
-    @test.create_stubs({api.lbaas: ('pools_get', 'vip_get',
-                                    'members_get', 'pool_get',
+    @test.create_stubs({api.lbaas: ('pools_get', 'vips_get',
+                                    'members_get',
                                     'pool_health_monitors_get'),
-                        api.neutron: ('subnet_get',)})
+                        api.neutron: ('subnet_list',)})
     def test_index_pools(self):
         self.set_up_expect()
 
@@ -112,10 +104,10 @@ class LoadBalancerTests(test.TestCase):
         self.assertEqual(len(res.context['table'].data),
                          len(self.pools.list()))
 
-    @test.create_stubs({api.lbaas: ('pools_get', 'vip_get',
-                                    'members_get', 'pool_get',
+    @test.create_stubs({api.lbaas: ('pools_get', 'vips_get',
+                                    'members_get',
                                     'pool_health_monitors_get'),
-                        api.neutron: ('subnet_get',)})
+                        api.neutron: ('subnet_list',)})
     def test_index_members(self):
         self.set_up_expect()
 
@@ -129,10 +121,10 @@ class LoadBalancerTests(test.TestCase):
         self.assertEqual(len(res.context['memberstable_table'].data),
                               len(self.members.list()))
 
-    @test.create_stubs({api.lbaas: ('pools_get', 'vip_get',
-                                    'pool_health_monitors_get',
-                                    'members_get', 'pool_get'),
-                        api.neutron: ('subnet_get',)})
+    @test.create_stubs({api.lbaas: ('pools_get', 'vips_get',
+                                    'members_get',
+                                    'pool_health_monitors_get'),
+                        api.neutron: ('subnet_list',)})
     def test_index_monitors(self):
         self.set_up_expect()
 
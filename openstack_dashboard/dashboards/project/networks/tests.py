@@ -96,15 +96,11 @@ def _str_host_routes(host_routes):
 
 class NetworkTests(test.TestCase):
 
-    @test.create_stubs({api.neutron: ('network_list',)})
+    @test.create_stubs({api.neutron: ('network_list_for_tenant',)})
     def test_index(self):
-        api.neutron.network_list(
+        api.neutron.network_list_for_tenant(
             IsA(http.HttpRequest),
-            tenant_id=self.tenant.id,
-            shared=False).AndReturn(self.networks.list())
-        api.neutron.network_list(
-            IsA(http.HttpRequest),
-            shared=True).AndReturn([])
+            self.tenant.id).AndReturn(self.networks.list())
 
         self.mox.ReplayAll()
 
@@ -114,12 +110,11 @@ class NetworkTests(test.TestCase):
         networks = res.context['networks_table'].data
         self.assertItemsEqual(networks, self.networks.list())
 
-    @test.create_stubs({api.neutron: ('network_list',)})
+    @test.create_stubs({api.neutron: ('network_list_for_tenant',)})
     def test_index_network_list_exception(self):
-        api.neutron.network_list(
+        api.neutron.network_list_for_tenant(
             IsA(http.HttpRequest),
-            tenant_id=self.tenant.id,
-            shared=False).AndRaise(self.exceptions.neutron)
+            self.tenant.id).AndRaise(self.exceptions.neutron)
         self.mox.ReplayAll()
 
         res = self.client.get(INDEX_URL)
@@ -486,18 +481,14 @@ class NetworkTests(test.TestCase):
 
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
-    @test.create_stubs({api.neutron: ('network_list',
+    @test.create_stubs({api.neutron: ('network_list_for_tenant',
                                       'subnet_list',
                                       'network_delete')})
     def test_delete_network_no_subnet(self):
         network = self.networks.first()
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 tenant_id=network.tenant_id,
-                                 shared=False)\
+        api.neutron.network_list_for_tenant(IsA(http.HttpRequest),
+                                            network.tenant_id)\
             .AndReturn([network])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 shared=True)\
-            .AndReturn([])
         api.neutron.subnet_list(IsA(http.HttpRequest), network_id=network.id)\
             .AndReturn([])
         api.neutron.network_delete(IsA(http.HttpRequest), network.id)
@@ -509,19 +500,16 @@ class NetworkTests(test.TestCase):
 
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
-    @test.create_stubs({api.neutron: ('network_list',
+    @test.create_stubs({api.neutron: ('network_list_for_tenant',
                                       'subnet_list',
                                       'network_delete',
                                       'subnet_delete')})
     def test_delete_network_with_subnet(self):
         network = self.networks.first()
         subnet = self.subnets.first()
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 tenant_id=network.tenant_id,
-                                 shared=False)\
+        api.neutron.network_list_for_tenant(IsA(http.HttpRequest),
+                                            network.tenant_id)\
             .AndReturn([network])
-        api.neutron.network_list(IsA(http.HttpRequest), shared=True)\
-            .AndReturn([])
         api.neutron.subnet_list(IsA(http.HttpRequest), network_id=network.id)\
             .AndReturn([subnet])
         api.neutron.subnet_delete(IsA(http.HttpRequest), subnet.id)
@@ -534,20 +522,16 @@ class NetworkTests(test.TestCase):
 
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
-    @test.create_stubs({api.neutron: ('network_list',
+    @test.create_stubs({api.neutron: ('network_list_for_tenant',
                                       'subnet_list',
                                       'network_delete',
                                       'subnet_delete')})
     def test_delete_network_exception(self):
         network = self.networks.first()
         subnet = self.subnets.first()
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 tenant_id=network.tenant_id,
-                                 shared=False)\
+        api.neutron.network_list_for_tenant(IsA(http.HttpRequest),
+                                            network.tenant_id)\
             .AndReturn([network])
-        api.neutron.network_list(IsA(http.HttpRequest),
-                                 shared=True)\
-            .AndReturn([])
         api.neutron.subnet_list(IsA(http.HttpRequest), network_id=network.id)\
             .AndReturn([subnet])
         api.neutron.subnet_delete(IsA(http.HttpRequest), subnet.id)
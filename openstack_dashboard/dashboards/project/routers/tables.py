@@ -105,6 +105,7 @@ class ClearGateway(tables.BatchAction):
 
 
 class UpdateRow(tables.Row):
+    __slots__ = ()
     ajax = True
 
     def get_data(self, request, router_id):
@@ -139,13 +139,9 @@ class RouterActionTests(test.TestCase):
         self.assertRedirectsNoFollow(res, self.INDEX_URL)
 
     def _mock_network_list(self, tenant_id):
-        api.neutron.network_list(
-            IsA(http.HttpRequest),
-            shared=False,
-            tenant_id=tenant_id).AndReturn(self.networks.list())
-        api.neutron.network_list(
+        api.neutron.network_list_for_tenant(
             IsA(http.HttpRequest),
-            shared=True).AndReturn([])
+            tenant_id).AndReturn(self.networks.list())
 
     def _test_router_addinterface(self, raise_error=False):
         router = self.routers.first()
@@ -185,13 +181,13 @@ class RouterActionTests(test.TestCase):
     @test.create_stubs({api.neutron: ('router_get',
                                       'router_add_interface',
                                       'port_get',
-                                      'network_list')})
+                                      'network_list_for_tenant')})
     def test_router_addinterface(self):
         self._test_router_addinterface()
 
     @test.create_stubs({api.neutron: ('router_get',
                                       'router_add_interface',
-                                      'network_list')})
+                                      'network_list_for_tenant')})
     def test_router_addinterface_exception(self):
         self._test_router_addinterface(raise_error=True)
 
@@ -233,29 +229,34 @@ class RouterActionTests(test.TestCase):
 
     @test.create_stubs({api.neutron: ('router_add_interface', 'subnet_get',
                                       'port_create',
-                                      'router_get', 'network_list')})
+                                      'router_get',
+                                      'network_list_for_tenant')})
     def test_router_addinterface_ip_addr(self):
         self._test_router_addinterface_ip_addr()
 
     @test.create_stubs({api.neutron: ('subnet_get',
-                                      'router_get', 'network_list')})
+                                      'router_get',
+                                      'network_list_for_tenant')})
     def test_router_addinterface_ip_addr_exception_subnet_get(self):
         self._test_router_addinterface_ip_addr(errors=['subnet_get'])
 
     @test.create_stubs({api.neutron: ('subnet_get', 'port_create',
-                                      'router_get', 'network_list')})
+                                      'router_get',
+                                      'network_list_for_tenant')})
     def test_router_addinterface_ip_addr_exception_port_create(self):
         self._test_router_addinterface_ip_addr(errors=['port_create'])
 
     @test.create_stubs({api.neutron: ('router_add_interface', 'subnet_get',
                                       'port_create', 'port_delete',
-                                      'router_get', 'network_list')})
+                                      'router_get',
+                                      'network_list_for_tenant')})
     def test_router_addinterface_ip_addr_exception_add_interface(self):
         self._test_router_addinterface_ip_addr(errors=['add_interface'])
 
     @test.create_stubs({api.neutron: ('router_add_interface', 'subnet_get',
                                       'port_create', 'port_delete',
-                                      'router_get', 'network_list')})
+                                      'router_get',
+                                      'network_list_for_tenant')})
     def test_router_addinterface_ip_addr_exception_port_delete(self):
         self._test_router_addinterface_ip_addr(errors=['add_interface',
                                                        'port_delete'])
@@ -52,6 +52,7 @@ class DeleteStack(tables.BatchAction):
 
 
 class StacksUpdateRow(tables.Row):
+    __slots__ = ()
     ajax = True
 
     def get_data(self, request, stack_id):
@@ -123,6 +124,7 @@ class EventsTable(tables.DataTable):
 
 
 class ResourcesUpdateRow(tables.Row):
+    __slots__ = ()
     ajax = True
 
     def get_data(self, request, resource_name):
@@ -18,7 +18,7 @@ from horizon import forms
 from horizon import messages
 from horizon.utils.fields import SelectWidget
 from horizon.utils.functions import bytes_to_gigabytes
-from horizon.utils.memoized import memoized
+from horizon.utils.memoized import request_memoized
 
 from openstack_dashboard import api
 from openstack_dashboard.api import cinder
@@ -241,11 +241,11 @@ class CreateForm(forms.SelfHandlingForm):
             self.api_error(_("Unable to create volume."))
             return False
 
-    @memoized
+    @request_memoized
     def get_snapshot(self, request, id):
         return cinder.volume_snapshot_get(request, id)
 
-    @memoized
+    @request_memoized
     def get_image(self, request, id):
         return glance.image_get(request, id)
 
@@ -16,6 +16,7 @@
 
 import logging
 
+from django.conf import settings
 from django.core.urlresolvers import NoReverseMatch
 from django.core.urlresolvers import reverse
 from django.template.defaultfilters import title
@@ -85,6 +86,7 @@ class CreateSnapshot(tables.LinkAction):
 
 
 class UpdateRow(tables.Row):
+    __slots__ = ()
     ajax = True
 
     def get_data(self, request, volume_id):
@@ -194,6 +196,7 @@ class VolumesTable(VolumesTableBase):
         row_class = UpdateRow
         table_actions = (CreateVolume, DeleteVolume, VolumesFilterAction)
         row_actions = (EditAttachments, CreateSnapshot, DeleteVolume)
+        page_size = getattr(settings, 'API_RESULT_PAGE_SIZE', 20)
 
 
 class DetachVolume(tables.BatchAction):
@@ -20,7 +20,13 @@
 
 from __future__ import absolute_import
 
+import datetime
+
+from django.core.cache import cache
+from django.test.utils import override_settings
+
 from horizon import exceptions
+from horizon.utils import instrumentation
 
 from openstack_dashboard.api import base as api_base
 from openstack_dashboard.test import helpers as test
@@ -73,6 +79,26 @@ class APIResourceWrapperTests(test.TestCase):
         with self.assertRaises(AttributeError):
             resource.baz
 
+    def test_attributes_resolved_directly(self):
+        self.assertEqual(APIResource._attr_set,
+                         frozenset(['foo', 'bar', 'baz']))
+        self.assertIsInstance(APIResource.__dict__['foo'],
+                              api_base.APIAttribute)
+        self.assertIsInstance(APIDict.__dict__['foo'],
+                              api_base.APIDictAttribute)
+
+    def test_slotted_wrappers(self):
+        class SlottedAPIDict(api_base.APIDictWrapper):
+            _attrs = ['foo']
+            __slots__ = ()
+
+        resource = SlottedAPIDict({'foo': 'foo', 'bar': 'bar'})
+        self.assertEqual(resource.foo, 'foo')
+        self.assertEqual(resource.bar, 'bar')
+        self.assertFalse(hasattr(resource, '__dict__'))
+        with self.assertRaises(AttributeError):
+            resource.baz
+
     def test_repr(self):
         resource = APIResource.get_instance()
         resource_str = resource.__repr__()
@@ -169,3 +195,122 @@ class ApiHelperTests(test.TestCase):
         self.request.user.services_region = "bogus_value"
         with self.assertRaises(exceptions.ServiceCatalogException):
             url = api_base.url_for(self.request, 'image')
+
+    def test_is_service_enabled(self):
+        self.assertTrue(api_base.is_service_enabled(self.request, 'compute'))
+        self.assertTrue(api_base.is_service_enabled(self.request, 'identity'))
+        self.assertFalse(api_base.is_service_enabled(self.request,
+                                                     'notAnApi'))
+
+        self.request.user.services_region = "RegionTwo"
+        self.assertFalse(api_base.is_service_enabled(self.request, 'image'))
+
+    def test_catalog_index(self):
+        user = self.request.user
+        index = api_base.get_catalog_index(user)
+        self.assertIs(api_base.get_catalog_index(user), index)
+
+        # The index follows the catalog of the user.
+        user.service_catalog = [service for service in user.service_catalog
+                                if service['type'] != 'compute']
+        self.assertIsNot(api_base.get_catalog_index(user), index)
+        self.assertFalse(api_base.is_service_enabled(self.request,
+                                                     'compute'))
+
+
+class CatalogResource(object):
+    """ Simple client resource for testing the catalog cache """
+    def __init__(self, manager, info, loaded=False):
+        self.manager = manager
+        self._info = info
+
+
+class ClientPoolTests(test.TestCase):
+    def setUp(self):
+        super(ClientPoolTests, self).setUp()
+        self.pool = api_base.ClientPool()
+        self.built = []
+
+    def build(self):
+        client = object()
+        self.built.append(client)
+        return client
+
+    def test_reuses_clients(self):
+        key = ('compute', 'http://nova', 'token_1')
+        client = self.pool.get(key, None, self.build)
+        self.assertIs(self.pool.get(key, None, self.build), client)
+        other = self.pool.get(('compute', 'http://nova', 'token_2'), None,
+                              self.build)
+        self.assertIsNot(other, client)
+        self.assertEqual(len(self.built), 2)
+
+    def test_evicts_expired_clients(self):
+        key = ('compute', 'http://nova', 'token_1')
+        expired = datetime.datetime.utcnow() - datetime.timedelta(minutes=1)
+        self.pool.get(key, expired, self.build)
+        self.pool.get(key, expired, self.build)
+        self.assertEqual(len(self.built), 2)
+        self.assertEqual(len(self.pool.clients), 0)
+
+    def test_bounded_size(self):
+        with self.settings(OPENSTACK_CLIENT_POOL_SIZE=2):
+            for token in ('token_1', 'token_2', 'token_1', 'token_3'):
+                self.pool.get(('compute', 'http://nova', token), None,
+                              self.build)
+        # The least recently used client is dropped first.
+        self.assertEqual([key[2] for key in self.pool.clients],
+                         ['token_1', 'token_3'])
+        self.assertEqual(len(self.built), 3)
+
+
+class CatalogCacheTests(test.TestCase):
+    def setUp(self):
+        super(CatalogCacheTests, self).setUp()
+        cache.clear()
+        self.fetched = 0
+
+    def fetch(self):
+        self.fetched += 1
+        return [CatalogResource(None, {'id': '1', 'name': 'm1.tiny'})]
+
+    def cached_flavors(self, manager=None):
+        return api_base.cached_catalog(self.request, 'flavors', 'compute',
+                                       'project', manager, self.fetch)
+
+    @override_settings(OPENSTACK_CATALOG_CACHE_TTL={'flavors': 60})
+    def test_cached_catalog(self):
+        self.cached_flavors()
+        manager = object()
+        flavors = self.cached_flavors(manager)
+        self.assertEqual(self.fetched, 1)
+        self.assertEqual(flavors[0]._info, {'id': '1', 'name': 'm1.tiny'})
+        # Resources are rebuilt with the manager of the current client.
+        self.assertIs(flavors[0].manager, manager)
+
+        # Other projects have catalogs of their own.
+        tenant_id = self.request.user.tenant_id
+        self.request.user.tenant_id = 'other_tenant'
+        self.cached_flavors()
+        self.assertEqual(self.fetched, 2)
+
+        api_base.invalidate_catalog(self.request, 'flavors', 'compute')
+        self.request.user.tenant_id = tenant_id
+        self.cached_flavors()
+        self.assertEqual(self.fetched, 3)
+
+    @override_settings(OPENSTACK_CATALOG_CACHE_TTL={'flavors': 60})
+    def test_cached_catalog_unwraps_manager(self):
+        self.cached_flavors()
+        manager = object()
+        proxy = instrumentation.ClientProxy(manager, [], 'compute')
+        flavors = self.cached_flavors(proxy)
+        self.assertEqual(self.fetched, 1)
+        # The cached resources don't refer to the proxy of the request.
+        self.assertIs(flavors[0].manager, manager)
+
+    @override_settings(OPENSTACK_CATALOG_CACHE_TTL={'flavors': 0})
+    def test_disabled_catalog_cache(self):
+        self.cached_flavors()
+        self.cached_flavors()
+        self.assertEqual(self.fetched, 2)
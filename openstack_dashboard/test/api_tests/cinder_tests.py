@@ -15,6 +15,11 @@
 #    under the License.
 
 
+from django import http
+from django.test.utils import override_settings
+
+from mox import IsA
+
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
 
@@ -31,6 +36,29 @@ class CinderApiTests(test.APITestCase):
         # No assertions are necessary. Verification is handled by mox.
         api.cinder.volume_list(self.request, search_opts=search_opts)
 
+    @override_settings(OPENSTACK_API_CONCURRENCY=1)
+    def test_volume_get_attached_instances(self):
+        servers = self.servers.list()[:2]
+        volume = self.volumes.first()
+        attachments = [{'id': '1', 'server_id': servers[0].id},
+                       {'id': '2', 'server_id': servers[1].id},
+                       {'id': '3', 'server_id': servers[0].id}]
+        volume = volume.__class__(volume.manager,
+                                  dict(volume._info, attachments=attachments))
+        cinderclient = self.stub_cinderclient()
+        cinderclient.volumes = self.mox.CreateMockAnything()
+        cinderclient.volumes.get(volume.id).AndReturn(volume)
+        self.mox.StubOutWithMock(api.nova, 'server_get')
+        # One call per instance, however many attachments it has.
+        for server in servers:
+            api.nova.server_get(IsA(http.HttpRequest), server.id) \
+                .AndReturn(server)
+        self.mox.ReplayAll()
+
+        volume = api.cinder.volume_get(self.request, volume.id)
+        self.assertEqual([a['instance_name'] for a in volume.attachments],
+                         [servers[0].name, servers[1].name, servers[0].name])
+
     def test_volume_snapshot_list(self):
         volume_snapshots = self.volume_snapshots.list()
         cinderclient = self.stub_cinderclient()
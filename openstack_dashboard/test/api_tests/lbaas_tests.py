@@ -14,6 +14,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from django import http
+
+from mox import IsA
 
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
@@ -154,6 +157,27 @@ class LbaasApiTests(test.APITestCase):
         for v in ret_val:
             self.assertIsInstance(v, api.lbaas.Pool)
 
+    @test.create_stubs({api.neutron: ('subnet_list',),
+                        api.lbaas: ('vips_get',)})
+    def test_pools_readable(self):
+        pools = self.pools.list()
+        subnets = self.subnets.list()
+        vips = self.vips.list()
+        # The subnets and vips are listed once for all the pools.
+        api.neutron.subnet_list(IsA(http.HttpRequest)).AndReturn(subnets)
+        api.lbaas.vips_get(IsA(http.HttpRequest)).AndReturn(vips)
+        self.mox.ReplayAll()
+
+        ret_val = api.lbaas.pools_readable(self.request, pools)
+        subnet_names = dict((s.id, s.cidr) for s in subnets)
+        vip_names = dict((v.id, v.name) for v in vips)
+        self.assertEqual(len(ret_val), len(pools))
+        for formatted, pool in zip(ret_val, pools):
+            self.assertEqual(formatted.id, pool.id)
+            self.assertEqual(formatted.subnet_name,
+                             subnet_names[pool.subnet_id])
+            self.assertEqual(formatted.vip_name, vip_names[pool.vip_id])
+
     @test.create_stubs({neutronclient: ('show_pool',)})
     def test_pool_get(self):
         pool = {'pool': {'id': 'abcdef-c3eb-4fee-9763-12de3338041e',
@@ -299,6 +323,22 @@ class LbaasApiTests(test.APITestCase):
         for v in ret_val:
             self.assertIsInstance(v, api.lbaas.Member)
 
+    @test.create_stubs({api.lbaas: ('pools_get',)})
+    def test_members_readable(self):
+        members = self.members.list()
+        pools = self.pools.list()
+        # The pools are listed once for all the members.
+        api.lbaas.pools_get(IsA(http.HttpRequest)).AndReturn(pools)
+        self.mox.ReplayAll()
+
+        ret_val = api.lbaas.members_readable(self.request, members)
+        pool_names = dict((p.id, p.name) for p in pools)
+        self.assertEqual(len(ret_val), len(members))
+        for formatted, member in zip(ret_val, members):
+            self.assertEqual(formatted.id, member.id)
+            self.assertEqual(formatted.pool_name,
+                             pool_names[member.pool_id])
+
     @test.create_stubs({neutronclient: ('show_member',)})
     def test_member_get(self):
         member = {'member': {'id': 'abcdef-c3eb-4fee-9763-12de3338041e',
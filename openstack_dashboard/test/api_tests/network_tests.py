@@ -331,12 +331,15 @@ class NetworkApiNeutronFloatingIpTests(NetworkApiNeutronTestBase):
 
     def test_floating_ip_list(self):
         fips = self.api_q_floating_ips.list()
+        assoc_port = self.api_ports.list()[1]
         self.qclient.list_floatingips().AndReturn({'floatingips': fips})
-        self.qclient.list_ports().AndReturn({'ports': self.api_ports.list()})
+        # Only the ports of the associated floating IPs are retrieved.
+        self.qclient.list_ports(id=[assoc_port['id']],
+                                fields=['id', 'device_id']) \
+            .AndReturn({'ports': [assoc_port]})
         self.mox.ReplayAll()
 
         rets = api.network.tenant_floating_ip_list(self.request)
-        assoc_port = self.api_ports.list()[1]
         self.assertEqual(len(fips), len(rets))
         for ret, exp in zip(rets, fips):
             for attr in ['id', 'ip', 'pool', 'fixed_ip', 'port_id']:
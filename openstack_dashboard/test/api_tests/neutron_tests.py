@@ -14,6 +14,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from django.test.utils import override_settings
+
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
 
@@ -32,19 +34,64 @@ class NeutronApiTests(test.APITestCase):
         for n in ret_val:
             self.assertIsInstance(n, api.neutron.Network)
 
+    @override_settings(OPENSTACK_API_CONCURRENCY=1)
+    def test_network_list_for_tenant(self):
+        networks = self.api_networks.list()
+        subnets = {'subnets': self.api_subnets.list()}
+        tenant_id = self.request.user.tenant_id
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_networks(tenant_id=tenant_id, shared=False) \
+            .AndReturn({'networks': networks[:1]})
+        neutronclient.list_networks(shared=True) \
+            .AndReturn({'networks': networks[1:]})
+        # A single subnet listing expands the networks of both listings.
+        neutronclient.list_subnets().AndReturn(subnets)
+        self.mox.ReplayAll()
+
+        ret_val = api.neutron.network_list_for_tenant(self.request,
+                                                      tenant_id)
+        self.assertEqual([n.id for n in ret_val],
+                         [n['id'] for n in networks])
+        for n in ret_val:
+            self.assertIsInstance(n, api.neutron.Network)
+            for subnet in n.subnets:
+                self.assertIsInstance(subnet, api.neutron.Subnet)
+
     def test_network_get(self):
         network = {'network': self.api_networks.first()}
-        subnet = {'subnet': self.api_subnets.first()}
+        subnets = {'subnets': [self.api_subnets.first()]}
         network_id = self.api_networks.first()['id']
         subnet_id = self.api_networks.first()['subnets'][0]
 
         neutronclient = self.stub_neutronclient()
         neutronclient.show_network(network_id).AndReturn(network)
-        neutronclient.show_subnet(subnet_id).AndReturn(subnet)
+        neutronclient.list_subnets(id=[subnet_id]).AndReturn(subnets)
         self.mox.ReplayAll()
 
         ret_val = api.neutron.network_get(self.request, network_id)
         self.assertIsInstance(ret_val, api.neutron.Network)
+        self.assertEqual([s.id for s in ret_val.subnets], [subnet_id])
+
+    def test_network_get_many_subnets(self):
+        subnets = self.api_subnets.list()
+        subnet_ids = [s['id'] for s in subnets]
+        network = dict(self.api_networks.first(), subnets=subnet_ids)
+        network_id = network['id']
+        self.mox.stubs.Set(api.neutron, 'MAX_IDS_PER_QUERY', 2)
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.show_network(network_id) \
+            .AndReturn({'network': network})
+        # The subnets are listed in chunks of at most MAX_IDS_PER_QUERY ids.
+        neutronclient.list_subnets(id=subnet_ids[:2]) \
+            .AndReturn({'subnets': subnets[:2]})
+        neutronclient.list_subnets(id=subnet_ids[2:]) \
+            .AndReturn({'subnets': subnets[2:]})
+        self.mox.ReplayAll()
+
+        ret_val = api.neutron.network_get(self.request, network_id)
+        self.assertEqual([s.id for s in ret_val.subnets], subnet_ids)
 
     def test_network_create(self):
         network = {'network': self.api_networks.first()}
@@ -48,6 +48,25 @@ class ServerWrapperTests(test.TestCase):
         server = api.nova.Server(self.servers.first(), self.request)
         self.assertEqual(server.image_name, image.name)
 
+    def test_image_names_looked_up_together(self):
+        class FakeServer(object):
+            def __init__(self, image_id):
+                self.image = {'id': image_id}
+
+        images = self.images.list()[:2]
+        servers = [api.nova.Server(FakeServer(image.id), self.request)
+                   for image in images + images]
+        api.nova.server_image_names(self.request).add_servers(servers)
+        self.mox.StubOutWithMock(api.glance, 'image_list_detailed')
+        self.mox.StubOutWithMock(api.glance, 'image_get')
+        api.glance.image_list_detailed(IsA(http.HttpRequest),
+                                       filters={'is_public': True}) \
+            .AndReturn([images, False])
+        self.mox.ReplayAll()
+
+        self.assertEqual([server.image_name for server in servers],
+                         [image.name for image in images + images])
+
 
 class ComputeApiTests(test.APITestCase):
 
@@ -93,6 +112,53 @@ class ComputeApiTests(test.APITestCase):
                                               console_type)
         self.assertIsInstance(ret_val, api.nova.VNCConsole)
 
+    @override_settings(OPENSTACK_API_CONCURRENCY=1)
+    def test_instance_volumes_list(self):
+        server = self.servers.first()
+        volumes = self.volumes.list()
+        attached = [volume.__class__(volume.manager, {'id': volume.id})
+                    for volume in volumes[1:]]
+        novaclient = self.stub_novaclient()
+        novaclient.volumes = self.mox.CreateMockAnything()
+        novaclient.volumes.get_server_volumes(server.id).AndReturn(attached)
+        cinderclient = self.stub_cinderclient()
+        cinderclient.volumes = self.mox.CreateMockAnything()
+        for volume in volumes[1:]:
+            cinderclient.volumes.get(volume.id).AndReturn(volume)
+        self.mox.ReplayAll()
+
+        ret_val = api.nova.instance_volumes_list(self.request, server.id)
+        self.assertEqual([volume.name for volume in ret_val],
+                         [volume.display_name for volume in volumes[1:]])
+
+    def test_aggregate_list(self):
+        aggregates = self.aggregates.list()
+        novaclient = self.stub_novaclient()
+        novaclient.aggregates = self.mox.CreateMockAnything()
+        novaclient.aggregates.list().AndReturn(aggregates)
+        self.mox.ReplayAll()
+
+        # The listing carries the hosts and metadata, no details are needed.
+        ret_val = api.nova.aggregate_list(self.request)
+        self.assertEqual(ret_val, aggregates)
+
+    @override_settings(OPENSTACK_API_CONCURRENCY=1)
+    def test_aggregate_list_without_details(self):
+        aggregates = self.aggregates.list()
+        listed = [aggregate.__class__(aggregate.manager,
+                                      {'id': aggregate.id,
+                                       'name': aggregate.name})
+                  for aggregate in aggregates]
+        novaclient = self.stub_novaclient()
+        novaclient.aggregates = self.mox.CreateMockAnything()
+        novaclient.aggregates.list().AndReturn(listed)
+        for aggregate in aggregates:
+            novaclient.aggregates.get(aggregate.id).AndReturn(aggregate)
+        self.mox.ReplayAll()
+
+        ret_val = api.nova.aggregate_list(self.request)
+        self.assertEqual(ret_val, aggregates)
+
     def test_server_spice_console(self):
         server = self.servers.first()
         console = self.servers.spice_console_data
@@ -44,7 +44,7 @@ class SwiftApiTests(test.APITestCase):
 
     def test_swift_create_duplicate_container(self):
         container = self.containers.first()
-        swift_api = self.stub_swiftclient(expected_calls=2)
+        swift_api = self.stub_swiftclient()
         # Check for existence, then create
         exc = self.exceptions.swift
         swift_api.head_container(container.name).AndRaise(exc)
@@ -109,7 +109,7 @@ class SwiftApiTests(test.APITestCase):
         container = self.containers.first()
         obj = self.objects.first()
 
-        swift_api = self.stub_swiftclient(expected_calls=2)
+        swift_api = self.stub_swiftclient()
         swift_api.head_object(container.name, obj.name).AndReturn(container)
 
         exc = self.exceptions.swift
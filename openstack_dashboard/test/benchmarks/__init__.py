@@ -0,0 +1,49 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Micro-benchmarks for the hot paths of table rendering and API wrappers,
+run against the test data fixtures. Each module can be run on its own from
+the root of the repository, e.g.::
+
+    python -m openstack_dashboard.test.benchmarks.tables
+"""
+
+import os
+import timeit
+
+
+def setup_environment():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE",
+                          "openstack_dashboard.test.settings")
+
+
+def time_per_item(func, items, repeat=3, number=1000):
+    """
+    Returns the best time, in microseconds, taken to call ``func`` on each
+    of ``items``.
+    """
+    def run():
+        for item in items:
+            func(item)
+    best = min(timeit.repeat(run, repeat=repeat, number=number))
+    return best / (number * len(items)) * 1e6
+
+
+def report(title, before, after):
+    print("%-45s %9.3f us %9.3f us %7.1fx"
+          % (title, before, after, before / after))
+
+
+def report_header(title):
+    print("")
+    print("%-45s %12s %12s %8s" % (title, "before", "after", "speedup"))
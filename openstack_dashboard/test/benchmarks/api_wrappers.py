@@ -0,0 +1,110 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Per-attribute cost of reading the attributes of the API wrappers.
+
+"before" goes through wrappers which check a list of attributes and format
+a message for every miss in ``__getattr__``, as the wrappers used to.
+"after" goes through the wrappers resolving their ``_attrs`` directly.
+"""
+
+import logging
+
+from openstack_dashboard.test import benchmarks
+benchmarks.setup_environment()
+
+from django.test.client import RequestFactory  # noqa
+
+from horizon import exceptions  # noqa
+
+from openstack_dashboard.api import neutron  # noqa
+from openstack_dashboard.api import nova  # noqa
+from openstack_dashboard.test.test_data import utils  # noqa
+
+
+LOG = logging.getLogger(__name__)
+
+
+class ListResourceWrapper(object):
+    """ The resource wrapper as it was before resolving attributes. """
+    _attrs = []
+
+    def __init__(self, apiresource):
+        self._apiresource = apiresource
+
+    def __getattr__(self, attr):
+        if attr in self._attrs:
+            return self._apiresource.__getattribute__(attr)
+        else:
+            msg = ('Attempted to access unknown attribute "%s" on '
+                   'APIResource object of type "%s" wrapping resource of '
+                   'type "%s".') % (attr, self.__class__,
+                                    self._apiresource.__class__)
+            LOG.debug(exceptions.error_color(msg))
+            raise AttributeError(attr)
+
+
+class ListDictWrapper(object):
+    """ The dict wrapper as it was before resolving attributes. """
+    def __init__(self, apidict):
+        self._apidict = apidict
+
+    def __getattr__(self, attr):
+        try:
+            return self._apidict[attr]
+        except KeyError:
+            msg = 'Unknown attribute "%(attr)s" on APIResource object ' \
+                  'of type "%(cls)s"' % {'attr': attr, 'cls': self.__class__}
+            LOG.debug(exceptions.error_color(msg))
+            raise AttributeError(msg)
+
+
+class ListServer(ListResourceWrapper):
+    _attrs = nova.Server._attrs
+
+
+def read(attr):
+    return lambda wrapper: getattr(wrapper, attr, None)
+
+
+def main():
+    # As in production, debug logging is off.
+    logging.getLogger('openstack_dashboard').setLevel(logging.INFO)
+    test_data = utils.load_test_data()
+    request = RequestFactory().get('/')
+    servers = test_data.servers.list()
+    ports = [port._apidict for port in test_data.ports.list()]
+    cases = (
+        ("Server.name (known attribute)", "name",
+         [ListServer(server) for server in servers],
+         [nova.Server(server, request) for server in servers]),
+        ("Server.task (missing attribute)", "task",
+         [ListServer(server) for server in servers],
+         [nova.Server(server, request) for server in servers]),
+        ("Port.device_id (known key)", "device_id",
+         [ListDictWrapper(port) for port in ports],
+         [neutron.Port(dict(port)) for port in ports]),
+        ("Port.task (missing key)", "task",
+         [ListDictWrapper(port) for port in ports],
+         [neutron.Port(dict(port)) for port in ports]),
+    )
+
+    benchmarks.report_header("Attribute read per wrapper")
+    for title, attr, before_data, after_data in cases:
+        before = benchmarks.time_per_item(read(attr), before_data)
+        after = benchmarks.time_per_item(read(attr), after_data)
+        benchmarks.report(title, before, after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Memory held by the rows, cells and cell data cache of a synthetic table of
+1000 rows and 12 columns.
+
+"before" builds the rows and cells with an instance dictionary and caches
+the cell data in a dictionary per column keyed by object id, as the tables
+used to. "after" uses the slotted rows and cells and the column store. The
+rows are AJAX row subclasses, like the ones the dashboards use.
+"""
+
+import gc
+import sys
+
+from openstack_dashboard.test import benchmarks
+benchmarks.setup_environment()
+
+from django.test.client import RequestFactory  # noqa
+
+from django.utils.datastructures import SortedDict  # noqa
+
+from horizon import tables  # noqa
+from horizon.tables import base  # noqa
+
+
+ROWS = 1000
+COLUMNS = 12
+
+
+class Datum(object):
+    def __init__(self, index):
+        self.id = "%08d" % index
+        self.name = "object_%s" % index
+        for column in range(COLUMNS):
+            setattr(self, "field_%s" % column, "value_%s_%s" % (index, column))
+
+
+class SyntheticRow(tables.Row):
+    __slots__ = ()
+    ajax = True
+
+    def get_data(self, request, obj_id):
+        return Datum(int(obj_id))
+
+
+class DictRow(SyntheticRow):
+    """ A row subclass without ``__slots__``, like the rows used to be. """
+
+
+def get_table_class(row_class):
+    attrs = {"Meta": type("Meta", (), {"name": "synthetic",
+                                       "row_class": row_class})}
+    for column in range(COLUMNS):
+        name = "field_%s" % column
+        attrs[name] = tables.Column(name)
+    return type("SyntheticTable", (tables.DataTable,), attrs)
+
+
+class DictCell(base.Cell):
+    """ A cell with an instance dictionary, like the cells used to have. """
+    def __init__(self, *args, **kwargs):
+        super(DictCell, self).__init__(*args, **kwargs)
+        self.attrs = {}
+        self.classes = []
+
+
+def deep_size(roots, exclude):
+    """
+    Returns the number of objects and bytes reachable from ``roots``,
+    without following any of the objects in ``exclude`` or classes.
+    """
+    seen = set(id(obj) for obj in exclude)
+    stack = list(roots)
+    count = size = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, type):
+            continue
+        seen.add(id(obj))
+        count += 1
+        size += sys.getsizeof(obj)
+        stack.extend(gc.get_referents(obj))
+    return count, size
+
+
+def measure_rows(table_class, data, cell_class):
+    """ Measures the rows of a table with cells of ``cell_class``. """
+    table = table_class(RequestFactory().get('/'), data)
+    rows = table.get_rows()
+    if cell_class is not base.Cell:
+        for row in rows:
+            row.cells = SortedDict([(name, cell_class(cell.datum, cell.data,
+                                                      cell.column, row))
+                                    for name, cell in row.cells.items()])
+    # The data objects, table and columns exist regardless of the rows.
+    exclude = list(data) + [table] + table.columns.values()
+    return deep_size([rows], exclude), table
+
+
+def measure_data_cache(table, dict_cache):
+    """ Measures the cell data cache of ``table`` as dicts or a store. """
+    if dict_cache:
+        cache = {}
+        for column in table.get_columns():
+            cache[column] = {}
+            for datum in table.data:
+                datum_id = table.get_object_id(datum)
+                cache[column][datum_id] = column.get_data(datum)
+    else:
+        cache = table._data_cache
+    # The ids and values themselves are shared with the data and cells.
+    exclude = table.get_columns()
+    for datum in table.data:
+        exclude.append(table.get_object_id(datum))
+        exclude.extend(column.get_data(datum)
+                       for column in table.get_columns())
+    return deep_size([cache], exclude)
+
+
+def report_memory(title, before, after):
+    (before_count, before_size), (after_count, after_size) = before, after
+    print("%-28s %8d objects %9.1f KiB %8d objects %9.1f KiB"
+          % (title, before_count, before_size / 1024.0,
+             after_count, after_size / 1024.0))
+
+
+def main():
+    data = [Datum(index) for index in range(ROWS)]
+
+    print("%d rows, %d columns" % (ROWS, COLUMNS))
+    print("%-28s %27s %27s" % ("", "before", "after"))
+    rows_before, table_before = measure_rows(get_table_class(DictRow), data,
+                                             DictCell)
+    rows_after, table_after = measure_rows(get_table_class(SyntheticRow),
+                                           data, base.Cell)
+    report_memory("rows and cells", rows_before, rows_after)
+    report_memory("cell data cache",
+                  measure_data_cache(table_before, dict_cache=True),
+                  measure_data_cache(table_after, dict_cache=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Per-cell cost of looking up column data on the instances table.
+
+"before" goes through the uncompiled lookup every column used to make for
+every cell, "after" through the accessors compiled per column and data type.
+"""
+
+from openstack_dashboard.test import benchmarks
+benchmarks.setup_environment()
+
+from django.test.client import RequestFactory  # noqa
+
+from openstack_dashboard.api import nova  # noqa
+from openstack_dashboard.dashboards.project.instances import tables  # noqa
+from openstack_dashboard.test.test_data import utils  # noqa
+
+
+def scan_display_choices(column, data):
+    """ The display choice lookup made for every cell before compiling. """
+    display_value = [display for (value, display) in column.display_choices
+                     if value.lower() == (data or '').lower()]
+    return display_value[0] if display_value else data
+
+
+def compiled_display_choices(column, data):
+    display_choices = column._get_display_choices()
+    return display_choices.get((data or '').lower(), data)
+
+
+def main():
+    test_data = utils.load_test_data()
+    request = RequestFactory().get('/')
+    servers = [nova.Server(server, request)
+               for server in test_data.servers.list()]
+    server_dicts = [server._info for server in test_data.servers.list()]
+    table = tables.InstancesTable(request, servers)
+
+    benchmarks.report_header("Column.get_raw_data per cell")
+    cases = (("name (wrapper attribute)", "name", servers),
+             ("status (wrapper attribute)", "status", servers),
+             ("task (missing attribute)", "task", servers),
+             ("name (dict key)", "name", server_dicts))
+    for title, column_name, data in cases:
+        column = table.columns[column_name]
+        before = benchmarks.time_per_item(column._lookup, data)
+        after = benchmarks.time_per_item(column.get_raw_data, data)
+        benchmarks.report(title, before, after)
+
+    benchmarks.report_header("display_choices lookup per cell")
+    for column_name in ("status", "task"):
+        column = table.columns[column_name]
+        values = [column.get_raw_data(server) for server in servers]
+        values += [choice for choice, display in column.display_choices]
+        before = benchmarks.time_per_item(
+            lambda data: scan_display_choices(column, data), values)
+        after = benchmarks.time_per_item(
+            lambda data: compiled_display_choices(column, data), values)
+        benchmarks.report(column_name, before, after)
+
+
+if __name__ == "__main__":
+    main()
@@ -247,6 +247,7 @@ class APITestCase(TestCase):
     def setUp(self):
         super(APITestCase, self).setUp()
         utils.patch_middleware_get_user()
+        api.base.client_pool.clear()
 
         def fake_keystoneclient(request, admin=False):
             """
@@ -276,6 +277,7 @@ class APITestCase(TestCase):
 
     def tearDown(self):
         super(APITestCase, self).tearDown()
+        api.base.client_pool.clear()
         api.glance.glanceclient = self._original_glanceclient
         api.nova.novaclient = self._original_novaclient
         api.keystone.keystoneclient = self._original_keystoneclient
@@ -96,6 +96,15 @@ OPENSTACK_HYPERVISOR_FEATURES = {
     'can_encrypt_volumes': False
 }
 
+# The tests expect every API call to reach the stubbed clients.
+OPENSTACK_CATALOG_CACHE_TTL = {
+    'flavors': 0,
+    'images': 0,
+    'availability_zones': 0,
+    'extensions': 0,
+    'roles': 0,
+}
+
 LOGGING['loggers']['openstack_dashboard'] = {
     'handlers': ['test'],
     'propagate': False,
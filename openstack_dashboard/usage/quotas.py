@@ -2,7 +2,7 @@ from collections import defaultdict
 import itertools
 
 from horizon import exceptions
-from horizon.utils.memoized import memoized
+from horizon.utils.memoized import request_memoized
 
 from openstack_dashboard.api.base import is_service_enabled
 from openstack_dashboard.api.base import QuotaSet
@@ -110,7 +110,7 @@ def get_disabled_quotas(request):
     return disabled_quotas
 
 
-@memoized
+@request_memoized
 def tenant_quota_usages(request):
     # Get our quotas and construct our usage object.
     disabled_quotas = get_disabled_quotas(request)